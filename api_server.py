@@ -0,0 +1,280 @@
+"""Headless HTTP/JSON API for the screening flow.
+
+Endpoints:
+    POST /sessions                     start a screening, returns an opaque session token
+    POST /sessions/<token>/messages    {"message": "..."} -> bot reply and next stage
+    GET  /sessions/<token>/summary     collected candidate data and questions
+    GET  /healthz                      liveness probe
+    GET  /metrics                      Prometheus metrics (when METRICS_ENABLED)
+
+Run with:
+
+    python api_server.py --host 0.0.0.0 --port 8080 --workers 4
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import secrets
+import signal
+import textwrap
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+from config import load_config
+
+load_config()
+
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 64 * 1024
+KEEPALIVE_TIMEOUT = 30.0
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class ScreeningAPI:
+    """Maps JSON requests onto CandidateScreeningBot.process_stage with state kept in the session store"""
+
+    def __init__(self, bot, store, executor):
+        self.bot = bot
+        self.store = store
+        self.executor = executor
+        self._locks = weakref.WeakValueDictionary()
+
+    async def dispatch(self, method, path, body):
+        """Route a request; returns (status, payload)"""
+        parts = [part for part in path.split("?")[0].split("/") if part]
+
+        if parts == ["healthz"] and method == "GET":
+            return HTTPStatus.OK, {"status": "ok"}
+        if parts == ["metrics"] and method == "GET":
+            import metrics
+            return HTTPStatus.OK, metrics.registry.render_prometheus()
+        if parts == ["sessions"] and method == "POST":
+            return HTTPStatus.CREATED, await self.start_session()
+        if len(parts) == 3 and parts[0] == "sessions":
+            token, action = parts[1], parts[2]
+            if action == "messages" and method == "POST":
+                return HTTPStatus.OK, await self.send_message(token, self._parse_message(body))
+            if action == "summary" and method == "GET":
+                return HTTPStatus.OK, await self.get_summary(token)
+            raise ApiError(HTTPStatus.METHOD_NOT_ALLOWED, "Method not allowed")
+        raise ApiError(HTTPStatus.NOT_FOUND, "Not found")
+
+    async def start_session(self):
+        token = secrets.token_urlsafe(24)
+        greeting = _clean(self.bot.get_greeting_message())
+        state = {
+            "messages": [{"role": "assistant", "content": greeting}],
+            "current_stage": "collect_name",
+            "candidate_data": {"_screening_id": token},
+            "conversation_active": True
+        }
+        await self._run(self.store.put, token, state)
+        return {"token": token, "reply": greeting, "stage": state["current_stage"], "done": False}
+
+    async def send_message(self, token, message):
+        # Serialize turns per session within this worker; the lock goes away with its last user
+        lock = self._locks.get(token)
+        if lock is None:
+            lock = self._locks[token] = asyncio.Lock()
+        async with lock:
+            state = await self._load(token)
+            if not state["conversation_active"]:
+                raise ApiError(HTTPStatus.CONFLICT, "Screening already concluded")
+
+            # LLM calls block, so the whole turn runs on the thread pool
+            reply, next_stage = await self._run(
+                self.bot.process_stage, state["current_stage"], message, state["candidate_data"]
+            )
+            reply = _clean(reply)
+            state["messages"].append({"role": "user", "content": message})
+            state["messages"].append({"role": "assistant", "content": reply})
+            state["current_stage"] = next_stage
+            state["conversation_active"] = next_stage != "conclusion"
+            await self._run(self.store.put, token, state)
+
+        return {"reply": reply, "stage": next_stage, "done": next_stage == "conclusion"}
+
+    async def get_summary(self, token):
+        state = await self._load(token)
+        candidate_data = {key: value for key, value in state["candidate_data"].items() if not key.startswith("_")}
+        return {"stage": state["current_stage"], "done": not state["conversation_active"], "candidate": candidate_data}
+
+    async def _load(self, token):
+        state = await self._run(self.store.get, token)
+        if state is None:
+            raise ApiError(HTTPStatus.NOT_FOUND, "Unknown or expired session token")
+        return state
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    @staticmethod
+    def _parse_message(body):
+        try:
+            message = json.loads(body or b"{}").get("message")
+        except (ValueError, AttributeError):
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Body must be a JSON object")
+        if not isinstance(message, str) or not message.strip():
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Field 'message' must be a non-empty string")
+        return message
+
+
+def _clean(text):
+    """Strip the indentation the chat UI's triple-quoted messages carry"""
+    return textwrap.dedent(text).strip()
+
+
+async def handle_connection(api, reader, writer):
+    """Serve HTTP/1.1 requests on one keep-alive connection"""
+    try:
+        while True:
+            try:
+                head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEPALIVE_TIMEOUT)
+            except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                return
+            except asyncio.LimitOverrunError:
+                await _respond(writer, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, {"error": "Headers too large"}, False)
+                return
+
+            lines = head.decode("latin-1").split("\r\n")
+            try:
+                method, path, version = lines[0].split(" ", 2)
+            except ValueError:
+                await _respond(writer, HTTPStatus.BAD_REQUEST, {"error": "Malformed request line"}, False)
+                return
+            headers = {}
+            for line in lines[1:]:
+                if ":" in line:
+                    name, value = line.split(":", 1)
+                    headers[name.strip().lower()] = value.strip()
+
+            keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+            # The body must be framed by Content-Length; anything else would be read as the next request
+            if "transfer-encoding" in headers:
+                if headers["transfer-encoding"].lower() == "chunked":
+                    status, error = HTTPStatus.LENGTH_REQUIRED, "Chunked bodies are not supported; send Content-Length"
+                else:
+                    status, error = HTTPStatus.NOT_IMPLEMENTED, "Unsupported Transfer-Encoding"
+                await _respond(writer, status, {"error": error}, False)
+                return
+            content_length = headers.get("content-length", "0") or "0"
+            if not (content_length.isascii() and content_length.isdigit()):
+                await _respond(writer, HTTPStatus.BAD_REQUEST, {"error": "Invalid Content-Length"}, False)
+                return
+            length = int(content_length)
+            if length > MAX_BODY_BYTES:
+                await _respond(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "Body too large"}, False)
+                return
+            try:
+                body = await asyncio.wait_for(reader.readexactly(length), KEEPALIVE_TIMEOUT) if length else b""
+            except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                return
+
+            try:
+                status, payload = await api.dispatch(method.upper(), path, body)
+            except ApiError as e:
+                status, payload = e.status, {"error": e.message}
+            except Exception as e:
+                print(f"API Server Error: {e}")
+                status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Internal server error"}
+
+            await _respond(writer, status, payload, keep_alive)
+            if not keep_alive:
+                return
+    finally:
+        writer.close()
+
+
+async def _respond(writer, status, payload, keep_alive):
+    if isinstance(payload, str):
+        body, content_type = payload.encode("utf-8"), "text/plain; version=0.0.4"
+    else:
+        body, content_type = json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json"
+    head = (
+        f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    writer.write(head.encode("latin-1") + body)
+    await writer.drain()
+
+
+async def serve(host, port, threads, reuse_port):
+    from chatbot import CandidateScreeningBot
+    from session_store import get_session_store
+    import metrics
+
+    try:
+        metrics.start_exporters()
+    except OSError as e:
+        # Only one worker can bind METRICS_PORT; the others still serve /metrics themselves
+        print(f"Metrics Exporter Error: {e}")
+    executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="api")
+    api = ScreeningAPI(CandidateScreeningBot(), get_session_store(), executor)
+
+    server = await asyncio.start_server(
+        lambda reader, writer: handle_connection(api, reader, writer),
+        host, port, reuse_port=reuse_port, limit=MAX_HEADER_BYTES, backlog=1024
+    )
+    print(f"[pid {os.getpid()}] Screening API listening on http://{host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+def run_worker(host, port, threads, reuse_port):
+    try:
+        asyncio.run(serve(host, port, threads, reuse_port))
+    except KeyboardInterrupt:
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless HTTP/JSON API for candidate screening")
+    parser.add_argument("--host", default=os.getenv("API_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("API_PORT", 8080)))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("API_WORKERS", 1)),
+                        help="worker processes sharing the port")
+    parser.add_argument("--threads", type=int, default=int(os.getenv("API_THREADS", 64)),
+                        help="threads per worker for blocking LLM and storage calls")
+    args = parser.parse_args()
+
+    if args.workers == 1:
+        run_worker(args.host, args.port, args.threads, False)
+        return
+
+    # Workers must see each other's sessions
+    if os.getenv("SESSION_STORE", "memory") == "memory":
+        print("Multiple workers need a shared session store; using SESSION_STORE=sqlite")
+        os.environ["SESSION_STORE"] = "sqlite"
+
+    workers = [
+        multiprocessing.Process(target=run_worker, args=(args.host, args.port, args.threads, True), daemon=True)
+        for _ in range(args.workers)
+    ]
+    for worker in workers:
+        worker.start()
+
+    def stop(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        for worker in workers:
+            worker.join()
+    except KeyboardInterrupt:
+        for worker in workers:
+            worker.terminate()
+
+
+if __name__ == "__main__":
+    main()
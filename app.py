@@ -1,10 +1,40 @@
 import streamlit as st
 import os
-from dotenv import load_dotenv
+import textwrap
+import uuid
+from config import load_config
 from chatbot import CandidateScreeningBot
+from session_store import SESSION_KEYS, get_session_store, get_transcript_store
+import metrics
 
 # Load environment variables
-load_dotenv()
+load_config()
+
+# Stream question generation into the chat instead of waiting for the full reply
+STREAM_RESPONSES = os.getenv("STREAM_RESPONSES", "true").lower() in ("1", "true", "yes")
+
+# Render older turns as one cached block and keep only the latest turns in memory
+INCREMENTAL_RENDERING = os.getenv("INCREMENTAL_RENDERING", "true").lower() in ("1", "true", "yes")
+RENDER_RECENT_MESSAGES = int(os.getenv("RENDER_RECENT_MESSAGES", 4))
+TRANSCRIPT_MAX_MESSAGES = int(os.getenv("TRANSCRIPT_MAX_MESSAGES", 20))
+
+# (stage, label, candidate_data key that marks it done)
+STAGE_LABELS = (
+    ("greeting", "✅ Welcome", None),
+    ("collect_name", "📝 Name", "name"),
+    ("collect_email", "📧 Email", "email"),
+    ("collect_phone", "📱 Phone", "phone"),
+    ("collect_experience", "💼 Experience", "experience"),
+    ("collect_position", "🎯 Position", "position"),
+    ("collect_location", "📍 Location", "location"),
+    ("collect_tech_stack", "💻 Tech Stack", "tech_stack"),
+    ("technical_questions", "❓ Questions", "questions"),
+    ("conclusion", "🎉 Complete", None)
+)
+ROLE_LABELS = {"user": "🧑 **You**", "assistant": "🤖 **Assistant**"}
+
+# st.fragment reruns only the sidebar on its own interactions (older Streamlit renders it with the page)
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda fn: fn)
 
 # Page configuration
 st.set_page_config(
@@ -13,20 +43,105 @@ st.set_page_config(
     layout="wide"
 )
 
+@st.cache_resource
+def get_shared_bot():
+    """The bot is stateless; every session passes in its own stage and candidate data"""
+    return CandidateScreeningBot()
+
+@st.cache_resource
+def get_shared_session_store():
+    """Compact per-session state lives here, so sessions survive reconnects and expire when idle"""
+    store = get_session_store()
+    # Sampled when metrics are exported, not on every turn
+    metrics.registry.register_collector("sessions", lambda: {"active": len(store)})
+    return store
+
+@st.cache_resource
+def get_shared_transcript_store():
+    """Spilled transcript pages, apart from the sessions so they are not counted as sessions"""
+    return get_transcript_store()
+
+@st.cache_resource
+def start_metrics_exporters():
+    """Start the Prometheus endpoint and JSON metrics log once per process"""
+    metrics.start_exporters()
+    return True
+
 # Initialize session state
 def initialize_session_state():
+    if "session_id" not in st.session_state:
+        # Restore the conversation when the browser reconnects with its session id
+        session_id = st.query_params.get("sid")
+        saved = get_shared_session_store().get(session_id) if session_id else None
+        if saved is None:
+            session_id = uuid.uuid4().hex
+        else:
+            st.session_state.update(saved)
+        st.session_state.session_id = session_id
+        st.query_params["sid"] = session_id
     if "messages" not in st.session_state:
         st.session_state.messages = []
-    if "bot" not in st.session_state:
-        st.session_state.bot = CandidateScreeningBot()
     if "current_stage" not in st.session_state:
         st.session_state.current_stage = "greeting"
     if "candidate_data" not in st.session_state:
-        st.session_state.candidate_data = {}
+        st.session_state.candidate_data = {"_screening_id": st.session_state.session_id}
     if "conversation_active" not in st.session_state:
         st.session_state.conversation_active = True
+    if "transcript_pages" not in st.session_state:
+        st.session_state.transcript_pages = 0
+        st.session_state.archived_messages = 0
+
+def save_session_state():
+    """Write the compact session state back to the session store"""
+    spill_transcript(get_shared_transcript_store())
+    get_shared_session_store().put(st.session_state.session_id, st.session_state)
+
+def transcript_key(page):
+    return f"{st.session_state.session_id}:transcript:{page}"
+
+def spill_transcript(store):
+    """Move the oldest turns to the transcript store once the in-memory transcript passes its cap"""
+    messages = st.session_state.messages
+    if not INCREMENTAL_RENDERING or len(messages) <= TRANSCRIPT_MAX_MESSAGES:
+        return
+    spilled = len(messages) - TRANSCRIPT_MAX_MESSAGES // 2
+    store.put(transcript_key(st.session_state.transcript_pages), {"messages": messages[:spilled]})
+    del messages[:spilled]
+    st.session_state.transcript_pages += 1
+    st.session_state.archived_messages += spilled
+
+def load_archived_messages():
+    """Spilled turns, oldest first; pages idle past the session TTL are gone"""
+    store = get_shared_transcript_store()
+    messages = []
+    for page in range(st.session_state.transcript_pages):
+        saved = store.get(transcript_key(page))
+        if saved is not None:
+            messages.extend(saved["messages"])
+    return messages
+
+def format_messages(messages):
+    """Markdown for a run of turns, shown as one block instead of one chat bubble each"""
+    return "\n\n---\n\n".join(
+        f"{ROLE_LABELS[message['role']]}\n\n{textwrap.dedent(message['content']).strip()}" for message in messages
+    )
+
+def render_history(messages):
+    """Render older messages from a cached block, extended only by turns added since the last run"""
+    cached = st.session_state.get("_rendered_history")
+    start = st.session_state.archived_messages
+    if cached is None or cached["start"] != start or cached["count"] > len(messages):
+        # Spilling shifted the transcript; rebuild once
+        cached = {"start": start, "count": 0, "markdown": ""}
+    if cached["count"] < len(messages):
+        added = format_messages(messages[cached["count"]:])
+        cached["markdown"] = f"{cached['markdown']}\n\n---\n\n{added}" if cached["markdown"] else added
+        cached["count"] = len(messages)
+        st.session_state._rendered_history = cached
+    st.markdown(cached["markdown"])
 
 def display_chat_interface():
+    bot = get_shared_bot()
     st.title("🤖 AI Candidate Screening Assistant")
     st.markdown("---")
     
@@ -35,18 +150,28 @@ def display_chat_interface():
     
     # Display conversation history
     with chat_container:
-        for message in st.session_state.messages:
+        messages = st.session_state.messages
+        if INCREMENTAL_RENDERING:
+            # A fixed label and key keep the toggle's state as more turns are archived
+            if st.session_state.archived_messages and st.toggle("Show earlier messages", key="_show_archived"):
+                st.markdown(format_messages(load_archived_messages()))
+            recent = max(len(messages) - RENDER_RECENT_MESSAGES, 0)
+            if recent:
+                render_history(messages[:recent])
+            messages = messages[recent:]
+        for message in messages:
             with st.chat_message(message["role"]):
                 st.markdown(message["content"])
     
     # Initial greeting
     if len(st.session_state.messages) == 0:
-        greeting = st.session_state.bot.get_greeting_message()
+        greeting = bot.get_greeting_message()
         st.session_state.messages.append({"role": "assistant", "content": greeting})
         with chat_container:
             with st.chat_message("assistant"):
                 st.markdown(greeting)
         st.session_state.current_stage = "collect_name"
+        save_session_state()
     
     # Chat input
     if st.session_state.conversation_active and st.session_state.current_stage != "conclusion":
@@ -60,17 +185,29 @@ def display_chat_interface():
             st.session_state.messages.append({"role": "user", "content": user_input})
             
             # Process bot response
-            with st.spinner("Processing..."):
-                response, next_stage = st.session_state.bot.process_stage(
+            if STREAM_RESPONSES:
+                chunks, next_stage = bot.process_stage_stream(
                     st.session_state.current_stage, 
                     user_input, 
                     st.session_state.candidate_data
                 )
-            
-            # Display bot response
-            with chat_container:
-                with st.chat_message("assistant"):
-                    st.markdown(response)
+                
+                # Render the response progressively as questions arrive
+                with chat_container:
+                    with st.chat_message("assistant"):
+                        response = st.write_stream(chunks)
+            else:
+                with st.spinner("Processing..."):
+                    response, next_stage = bot.process_stage(
+                        st.session_state.current_stage, 
+                        user_input, 
+                        st.session_state.candidate_data
+                    )
+                
+                # Display bot response
+                with chat_container:
+                    with st.chat_message("assistant"):
+                        st.markdown(response)
             st.session_state.messages.append({"role": "assistant", "content": response})
             
             # Update stage
@@ -80,54 +217,62 @@ def display_chat_interface():
             if next_stage == "conclusion":
                 st.session_state.conversation_active = False
                 st.balloons()
+            
+            save_session_state()
     
     # Restart button
     if not st.session_state.conversation_active:
         if st.button("🔄 Start New Screening", type="primary"):
-            # Reset session state
-            for key in ["messages", "current_stage", "candidate_data", "conversation_active"]:
+            # Reset session state; the new screening gets a fresh session id
+            transcript_store = get_shared_transcript_store()
+            for page in range(st.session_state.transcript_pages):
+                transcript_store.delete(transcript_key(page))
+            get_shared_session_store().delete(st.session_state.session_id)
+            for key in SESSION_KEYS + ("session_id", "_rendered_history", "_sidebar", "_show_archived"):
                 if key in st.session_state:
                     del st.session_state[key]
+            del st.query_params["sid"]
             st.rerun()
 
+def sidebar_markdown(candidate_data):
+    """Progress and data preview, rebuilt only when the candidate data changes"""
+    signature = repr(sorted((key, value) for key, value in candidate_data.items() if not key.startswith("_")))
+    cached = st.session_state.get("_sidebar")
+    if cached is None or cached[0] != signature:
+        progress = "\n".join(
+            f"- {label}" + (" ✅" if key and key in candidate_data else "") for _, label, key in STAGE_LABELS
+        )
+        preview = "\n".join(
+            f"{key.title()}: {', '.join(value) if isinstance(value, list) else value}"
+            for key, value in candidate_data.items() if key != "questions" and not key.startswith("_")
+        )
+        cached = st.session_state._sidebar = (signature, progress, preview)
+    return cached[1], cached[2]
+
+@fragment
+def render_sidebar():
+    st.header("📋 Screening Progress")
+    progress, preview = sidebar_markdown(st.session_state.candidate_data)
+    
+    # Progress tracking
+    st.markdown(progress)
+    
+    st.markdown("---")
+    
+    # Current data preview
+    if preview:
+        st.subheader("📊 Collected Information")
+        st.text(preview)
+    
+    st.markdown("---")
+    st.markdown("""**💡 Tips:**
+- Be specific with your tech stack
+- Type 'exit' to quit anytime
+- All information is processed securely""")
+
 def display_sidebar():
     with st.sidebar:
-        st.header("📋 Screening Progress")
-        
-        # Progress tracking
-        stages_completed = {
-            "greeting": "✅ Welcome",
-            "collect_name": "📝 Name" + (" ✅" if "name" in st.session_state.candidate_data else ""),
-            "collect_email": "📧 Email" + (" ✅" if "email" in st.session_state.candidate_data else ""),
-            "collect_phone": "📱 Phone" + (" ✅" if "phone" in st.session_state.candidate_data else ""),
-            "collect_experience": "💼 Experience" + (" ✅" if "experience" in st.session_state.candidate_data else ""),
-            "collect_position": "🎯 Position" + (" ✅" if "position" in st.session_state.candidate_data else ""),
-            "collect_location": "📍 Location" + (" ✅" if "location" in st.session_state.candidate_data else ""),
-            "collect_tech_stack": "💻 Tech Stack" + (" ✅" if "tech_stack" in st.session_state.candidate_data else ""),
-            "technical_questions": "❓ Questions" + (" ✅" if "questions" in st.session_state.candidate_data else ""),
-            "conclusion": "🎉 Complete"
-        }
-        
-        for stage, label in stages_completed.items():
-            st.markdown(f"- {label}")
-        
-        st.markdown("---")
-        
-        # Current data preview
-        if st.session_state.candidate_data:
-            st.subheader("📊 Collected Information")
-            for key, value in st.session_state.candidate_data.items():
-                if key != "questions":
-                    if isinstance(value, list):
-                        st.text(f"{key.title()}: {', '.join(value)}")
-                    else:
-                        st.text(f"{key.title()}: {value}")
-        
-        st.markdown("---")
-        st.markdown("**💡 Tips:**")
-        st.markdown("- Be specific with your tech stack")
-        st.markdown("- Type 'exit' to quit anytime")
-        st.markdown("- All information is processed securely")
+        render_sidebar()
 
 def main():
     # Check for API key
@@ -135,6 +280,8 @@ def main():
         st.error("⚠️ Perplexity API Key not found. Please set PERPLEXITY_API_KEY in your environment variables.")
         st.stop()
     
+    start_metrics_exporters()
+    
     # Initialize session state
     initialize_session_state()
     
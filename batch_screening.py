@@ -0,0 +1,207 @@
+"""Bulk screening of candidates from a CSV or Parquet file.
+
+Rows are read in chunks, validated with DataValidator's vectorized checks, and
+their tech stacks parsed the same way as in the chat. Questions are generated
+once per unique stack on a bounded thread pool, with API calls held to the
+quota by the shared rate limiter, and results are appended to the output
+chunk by chunk.
+
+    python batch_screening.py candidates.csv screened.csv --concurrency 8 --rpm 50
+"""
+import argparse
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from config import load_config
+
+load_config()
+
+REQUIRED_COLUMNS = ["name", "email", "phone", "experience", "tech_stack"]
+OPTIONAL_COLUMNS = ["position", "location"]
+OUTPUT_COLUMNS = ["row", "status", "errors", "name", "email", "phone", "experience",
+                  "position", "location", "tech_stack", "questions"]
+
+
+def read_chunks(path, chunk_size):
+    """Yield DataFrames of at most chunk_size rows without loading the whole file"""
+    import pandas as pd
+
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size, dtype=str, keep_default_na=False)
+
+
+class ChunkWriter:
+    """Appends result chunks to a CSV or Parquet file"""
+
+    def __init__(self, path):
+        self.path = path
+        self._parquet = None
+        self._wrote_header = False
+
+    def write(self, frame):
+        if self.path.endswith(".parquet"):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            if self._parquet is None:
+                schema = pa.schema([("row", pa.int64()), ("experience", pa.float64())] +
+                                   [(column, pa.string()) for column in OUTPUT_COLUMNS
+                                    if column not in ("row", "experience")])
+                self._parquet = pq.ParquetWriter(self.path, schema)
+            table = pa.Table.from_pandas(frame, preserve_index=False).select(self._parquet.schema.names)
+            self._parquet.write_table(table.cast(self._parquet.schema))
+        else:
+            frame.to_csv(self.path, mode="a" if self._wrote_header else "w",
+                         header=not self._wrote_header, index=False)
+            self._wrote_header = True
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+
+
+class BatchScreener:
+    """Validates candidate rows and generates questions per unique tech stack"""
+
+    def __init__(self, bot, concurrency=8):
+        self.bot = bot
+        self.executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="batch")
+        self.stats = {"rows": 0, "ok": 0, "invalid": 0, "error": 0, "stacks": 0}
+
+    def run(self, input_path, output_path, chunk_size=1000):
+        """Screen every row of input_path into output_path; returns the stats"""
+        writer = ChunkWriter(output_path)
+        # One chunk is generated while the previous one is written, so the pool never drains between chunks
+        pending = deque()
+        row_offset = 0
+        try:
+            for chunk in read_chunks(input_path, chunk_size):
+                pending.append(self.submit_chunk(chunk, row_offset))
+                row_offset += len(chunk)
+                if len(pending) > 1:
+                    writer.write(self.finish_chunk(*pending.popleft()))
+            while pending:
+                writer.write(self.finish_chunk(*pending.popleft()))
+        finally:
+            writer.close()
+        return self.stats
+
+    def submit_chunk(self, chunk, row_offset):
+        """Validate a chunk and start question generation for its unique stacks"""
+        import pandas as pd
+
+        chunk = chunk.rename(columns=lambda column: str(column).strip().lower())
+        missing = [column for column in REQUIRED_COLUMNS if column not in chunk.columns]
+        if missing:
+            raise ValueError(f"Input is missing required columns: {', '.join(missing)}")
+        for column in OPTIONAL_COLUMNS:
+            if column not in chunk.columns:
+                chunk[column] = ""
+
+        frame = pd.DataFrame({"row": range(row_offset, row_offset + len(chunk))})
+        for column in REQUIRED_COLUMNS + OPTIONAL_COLUMNS:
+            frame[column] = chunk[column].fillna("").astype(str).str.strip().to_numpy()
+
+        validator = self.bot.validator
+        checks = {
+            "invalid name": validator.validate_names(frame["name"]),
+            "invalid email": validator.validate_emails(frame["email"]),
+            "invalid phone": validator.validate_phones(frame["phone"]),
+            "invalid experience": validator.validate_experiences(frame["experience"]),
+            "empty tech stack": frame["tech_stack"] != ""
+        }
+        errors = pd.Series("", index=frame.index)
+        for message, valid in checks.items():
+            errors = errors.where(valid, errors + message + "; ")
+        frame["errors"] = errors.str.rstrip("; ")
+        frame["experience"] = pd.to_numeric(frame["experience"], errors="coerce")
+
+        # Parse each distinct raw stack once; only valid rows get questions
+        parsed = {raw: self.bot._parse_tech_stack(raw) for raw in frame["tech_stack"].unique()}
+        frame["tech_stack"] = frame["tech_stack"].map(parsed)
+
+        stacks = {}
+        for tech_stack in frame.loc[frame["errors"] == "", "tech_stack"]:
+            stacks.setdefault(self._key(tech_stack), tech_stack)
+        futures = {key: self.executor.submit(self._generate, tech_stack) for key, tech_stack in stacks.items()}
+        self.stats["stacks"] += len(futures)
+        return frame, futures
+
+    def finish_chunk(self, frame, futures):
+        """Wait for a chunk's questions and return its output frame"""
+        results = {key: future.result() for key, future in futures.items()}
+
+        statuses, errors, questions = [], [], []
+        for tech_stack, error in zip(frame["tech_stack"], frame["errors"]):
+            if error:
+                statuses.append("invalid")
+                errors.append(error)
+                questions.append([])
+                continue
+            generated, generation_error = results[self._key(tech_stack)]
+            statuses.append("error" if generation_error else "ok")
+            errors.append(generation_error)
+            questions.append(generated)
+
+        frame["status"] = statuses
+        frame["errors"] = errors
+        frame["questions"] = [json.dumps(batch) for batch in questions]
+        frame["tech_stack"] = frame["tech_stack"].map(", ".join)
+
+        self.stats["rows"] += len(frame)
+        for status in statuses:
+            self.stats[status] += 1
+        return frame[OUTPUT_COLUMNS]
+
+    def _generate(self, tech_stack):
+        """Return (questions, error message) so one failing stack only fails its own rows"""
+        try:
+            return self.bot.question_generator.generate_questions(tech_stack, fallback=False), ""
+        except Exception as e:
+            return [], f"question generation failed: {e}"
+
+    @staticmethod
+    def _key(tech_stack):
+        from question_cache import stack_key
+        return stack_key(tech_stack)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Screen a CSV or Parquet file of candidates in bulk")
+    parser.add_argument("input", help="candidates file (.csv or .parquet) with name, email, phone, experience, "
+                                      "tech_stack and optionally position, location columns")
+    parser.add_argument("output", help="results file (.csv or .parquet)")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="rows held in memory per chunk")
+    parser.add_argument("--concurrency", type=int, default=int(os.getenv("BATCH_CONCURRENCY", 8)),
+                        help="question generation requests in flight")
+    parser.add_argument("--rpm", type=float, help="API requests per minute (default LLM_REQUESTS_PER_MINUTE)")
+    parser.add_argument("--tpm", type=float, help="API tokens per minute (default LLM_TOKENS_PER_MINUTE)")
+    args = parser.parse_args()
+
+    # The shared limiter reads its quota from the environment; rows queue for quota instead of failing
+    os.environ["LLM_WAIT_FOR_QUOTA"] = "true"
+    if args.rpm is not None:
+        os.environ["LLM_REQUESTS_PER_MINUTE"] = str(args.rpm)
+    if args.tpm is not None:
+        os.environ["LLM_TOKENS_PER_MINUTE"] = str(args.tpm)
+
+    from chatbot import CandidateScreeningBot
+
+    bot = CandidateScreeningBot()
+    started = time.perf_counter()
+    stats = BatchScreener(bot, args.concurrency).run(args.input, args.output, args.chunk_size)
+    elapsed = time.perf_counter() - started
+    print(f"Screened {stats['rows']} rows in {elapsed:.1f}s: {stats['ok']} ok, {stats['invalid']} invalid, "
+          f"{stats['error']} failed, {stats['stacks']} stacks requested -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Cold-start benchmark: import time, bot construction and first responses in a fresh process.
+
+Each run starts a new interpreter that imports chatbot, builds CandidateScreeningBot and
+answers a first non-LLM turn and, after a pause standing in for the candidate typing, a first
+question-generation turn against a local stub, for each STARTUP_MODE. Run from the repository root:
+
+    python benchmarks/bench_cold_start.py --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stub_server import start_stub_server  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("openai", "httpx", "numpy", "pandas", "tiktoken")
+
+CHILD = """
+import json, sys, time
+started = time.perf_counter()
+import chatbot
+imported = time.perf_counter()
+bot = chatbot.CandidateScreeningBot()
+built = time.perf_counter()
+loaded = [name for name in %r if name in sys.modules]
+candidate_data = {}
+bot.process_stage("collect_name", "Jane Doe", candidate_data)
+first_turn = time.perf_counter()
+time.sleep(%r)
+asked = time.perf_counter()
+bot.process_stage("collect_tech_stack", "Python, Django", candidate_data)
+first_questions = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - started) * 1e3,
+    "init_ms": (built - imported) * 1e3,
+    "first_turn_ms": (first_turn - built) * 1e3,
+    "first_questions_ms": (first_questions - asked) * 1e3,
+    "ready_ms": (built - started) * 1e3,
+    "loaded_at_ready": loaded
+}))
+"""
+
+
+def run_once(mode, base_url, workdir, think_seconds):
+    env = dict(
+        os.environ,
+        STARTUP_MODE=mode,
+        PERPLEXITY_API_KEY="bench",
+        LLM_BASE_URL=base_url,
+        LLM_TRANSPORT="live",
+        LLM_BACKEND="openai",
+        QUESTION_CACHE_PATH=os.path.join(workdir, "question_cache.db"),
+        QUESTION_CACHE_MEMORY_ENTRIES="0",
+        QUESTION_BANK_PATH=os.path.join(workdir, "missing_bank.json"),
+        QUESTION_INDEX_PATH="",
+        SCREENING_STORE_PATH=os.path.join(workdir, "screenings.db"),
+        METRICS_ENABLED="false"
+    )
+    # A fresh cache per run, so the first questions always come from the stub
+    for name in ("question_cache.db", "question_cache.db-wal", "question_cache.db-shm"):
+        path = os.path.join(workdir, name)
+        if os.path.exists(path):
+            os.remove(path)
+    child = CHILD % (HEAVY_MODULES, think_seconds)
+    output = subprocess.check_output([sys.executable, "-c", child], cwd=ROOT, env=env, text=True)
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="fresh processes per startup mode")
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="stub response latency")
+    parser.add_argument("--think-ms", type=float, default=2000.0,
+                        help="pause before the question turn, standing in for the contact-detail stages")
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(latency_ms=args.latency_ms)
+    columns = ("import_ms", "init_ms", "ready_ms", "first_turn_ms", "first_questions_ms")
+    print(f"{'mode':<10}  " + "  ".join(f"{column:>18}" for column in columns) + "  loaded at ready")
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            for mode in ("lazy", "background", "eager"):
+                results = [run_once(mode, base_url, workdir, args.think_ms / 1000) for _ in range(args.runs)]
+                medians = [statistics.median(result[column] for result in results) for column in columns]
+                print(f"{mode:<10}  " + "  ".join(f"{value:>18.1f}" for value in medians) +
+                      f"  {', '.join(results[-1]['loaded_at_ready']) or '-'}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Micro-benchmark: per-turn cost of exit detection and stage validation, checked against a correctness corpus.
+
+Run from the repository root:
+
+    python benchmarks/bench_intent_classifier.py
+
+Exits non-zero if any case in benchmarks/intent_corpus.jsonl is misclassified.
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_validator import DataValidator  # noqa: E402
+from intent_classifier import EXIT_KEYWORDS, IntentClassifier  # noqa: E402
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "intent_corpus.jsonl")
+
+
+def load_corpus(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def legacy_classify(stage, text):
+    """Baseline: the original substring exit scan followed by the DataValidator checks"""
+    if any(keyword in text.lower() for keyword in EXIT_KEYWORDS):
+        return True, False, None
+    validators = {
+        "collect_name": DataValidator.validate_name,
+        "collect_email": DataValidator.validate_email,
+        "collect_phone": DataValidator.validate_phone,
+        "collect_experience": DataValidator.validate_experience
+    }
+    validate = validators.get(stage)
+    return False, bool(validate(text.strip())) if validate else True, text.strip()
+
+
+def check(classifier, corpus):
+    """Misclassified cases as (case, got)"""
+    failures = []
+    for case in corpus:
+        got = classifier.classify(case["stage"], case["text"])
+        if got != (case["exit"], case["valid"], case["value"]):
+            failures.append((case, got))
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", default=CORPUS_PATH)
+    parser.add_argument("--repeat", type=int, default=20000, help="messages classified per measurement")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    classifier = IntentClassifier()
+
+    failures = check(classifier, corpus)
+    legacy_failures = sum(
+        legacy_classify(case["stage"], case["text"])[:2] != (case["exit"], case["valid"]) for case in corpus
+    )
+    print(f"corpus: {len(corpus) - len(failures)}/{len(corpus)} correct "
+          f"(substring scan baseline gets {len(corpus) - legacy_failures}/{len(corpus)} exit/valid right)")
+    for case, got in failures:
+        print(f"  MISMATCH {case['stage']} {case['text']!r}: expected "
+              f"{(case['exit'], case['valid'], case['value'])}, got {got}")
+
+    turns = [(case["stage"], case["text"]) for case in corpus]
+    turns = (turns * (args.repeat // len(turns) + 1))[:args.repeat]
+    compiled = timeit.timeit(lambda: [classifier.classify(stage, text) for stage, text in turns], number=1)
+    legacy = timeit.timeit(lambda: [legacy_classify(stage, text) for stage, text in turns], number=1)
+    print(f"{'classifier us/turn':>18}  {'legacy us/turn':>14}")
+    print(f"{compiled / args.repeat * 1e6:>18.2f}  {legacy / args.repeat * 1e6:>14.2f}")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
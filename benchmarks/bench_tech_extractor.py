@@ -0,0 +1,69 @@
+"""Micro-benchmark: per-message cost of tech-stack extraction as the vocabulary grows.
+
+Run from the repository root:
+
+    python benchmarks/bench_tech_extractor.py
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tech_extractor import TECH_CATEGORIES, TechExtractor  # noqa: E402
+
+MESSAGES = [
+    "Python, Django, PostgreSQL, Docker",
+    "I mostly do React and AWS, some node.js and k8s on the side",
+    "C++; C#; .NET core; SQL Server; Azure",
+    "sklearn, pandas, numpy, pytorch, cv2, and a bit of tensorflow",
+    "Java Spring Boot with MySQL and Redis deployed on GCP via Jenkins",
+]
+
+
+def synthetic_categories(size, seed=0):
+    """TECH_CATEGORIES padded with random technology-like terms up to roughly size entries"""
+    rng = random.Random(seed)
+    categories = {category: list(techs) for category, techs in TECH_CATEGORIES.items()}
+    extra = categories.setdefault("Synthetic", [])
+    while sum(len(techs) for techs in categories.values()) < size:
+        extra.append("".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10))))
+    return categories
+
+
+def linear_scan(categories, text):
+    """Baseline: the original per-item scan over every category list"""
+    matched = []
+    for item in (part.strip().lower() for part in text.replace(";", ",").split(",")):
+        for techs in categories.values():
+            if item in techs:
+                matched.append(item)
+                break
+    return matched
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 500, 5000, 50000])
+    parser.add_argument("--repeat", type=int, default=2000, help="messages processed per measurement")
+    args = parser.parse_args()
+
+    print(f"{'vocabulary':>10}  {'build ms':>9}  {'extract us/msg':>14}  {'linear scan us/msg':>18}")
+    for size in args.sizes:
+        categories = synthetic_categories(size)
+        build = timeit.timeit(lambda: TechExtractor(categories), number=1)
+        extractor = TechExtractor(categories)
+
+        messages = (MESSAGES * (args.repeat // len(MESSAGES) + 1))[:args.repeat]
+        extract = timeit.timeit(lambda: [extractor.extract(m) for m in messages], number=1)
+        scan = timeit.timeit(lambda: [linear_scan(categories, m) for m in messages], number=1)
+
+        print(f"{extractor.vocabulary_size:>10}  {build * 1e3:>9.1f}  "
+              f"{extract / args.repeat * 1e6:>14.1f}  {scan / args.repeat * 1e6:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Bulk screening under a tight quota: more unique stacks than --rpm must all come back ok.
+
+Runs batch_screening.py against the in-process stub with fewer requests per minute than
+there are stacks, so most requests have to queue for quota well past the per-call
+deadline. Run from the repository root (it takes a little over a minute by default):
+
+    python benchmarks/check_batch_quota.py
+
+Exits non-zero if any row is not ok.
+"""
+import argparse
+import csv
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stub_server import start_stub_server  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from question_bank import common_stacks  # noqa: E402
+from tech_extractor import TECH_CATEGORIES  # noqa: E402
+
+
+def write_candidates(path, stacks):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["name", "email", "phone", "experience", "tech_stack"])
+        for i, stack in enumerate(stacks):
+            writer.writerow([f"Candidate {chr(65 + i % 26)}", f"candidate{i}@example.com", "+1 415 555 0134",
+                             "3", ", ".join(stack)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rpm", type=float, default=20.0, help="requests per minute for the run")
+    parser.add_argument("--stacks", type=int, default=24, help="unique stacks, more than --rpm")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--deadline-seconds", type=float, default=5.0,
+                        help="per-call deadline, well below the time the last stack waits for quota")
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(latency_ms=50)
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            input_path = os.path.join(workdir, "candidates.csv")
+            output_path = os.path.join(workdir, "screened.csv")
+            write_candidates(input_path, common_stacks(TECH_CATEGORIES, args.stacks))
+            env = dict(
+                os.environ,
+                PERPLEXITY_API_KEY="check",
+                LLM_BASE_URL=base_url,
+                LLM_TRANSPORT="live",
+                LLM_BACKEND="openai",
+                LLM_CALL_DEADLINE_SECONDS=str(args.deadline_seconds),
+                QUESTION_SLO_ENABLED="false",
+                QUESTION_CACHE_PATH="",
+                QUESTION_CACHE_MEMORY_ENTRIES="0",
+                QUESTION_BANK_PATH=os.path.join(workdir, "missing_bank.json"),
+                QUESTION_INDEX_PATH="",
+                METRICS_ENABLED="false"
+            )
+            started = time.perf_counter()
+            subprocess.check_call([sys.executable, "batch_screening.py", input_path, output_path,
+                                   "--rpm", str(args.rpm), "--concurrency", str(args.concurrency)],
+                                  cwd=ROOT, env=env)
+            elapsed = time.perf_counter() - started
+            with open(output_path, newline="", encoding="utf-8") as f:
+                rows = list(csv.DictReader(f))
+    finally:
+        server.shutdown()
+
+    statuses = {}
+    for row in rows:
+        statuses[row["status"]] = statuses.get(row["status"], 0) + 1
+    print(f"{len(rows)} rows at {args.rpm:g} rpm in {elapsed:.1f}s: {statuses}")
+    for row in rows:
+        if row["status"] != "ok":
+            print(f"  row {row['row']}: {row['status']} {row['errors']}")
+    sys.exit(0 if rows and statuses == {"ok": len(rows)} else 1)
+
+
+if __name__ == "__main__":
+    main()
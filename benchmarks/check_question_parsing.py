@@ -0,0 +1,64 @@
+"""Regression cases for question reply parsing, block and streamed.
+
+Each reply shape is parsed whole with parse_question_list and fed in small chunks to
+QuestionStreamParser; both must return the expected questions. Run from the repository root:
+
+    python benchmarks/check_question_parsing.py
+
+Exits non-zero on any mismatch.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from prompts import QuestionStreamParser, parse_question_list  # noqa: E402
+
+QUESTIONS = ["What is a decorator?", "How does Django's ORM build queries?", "When would you add an index?"]
+
+CASES = {
+    "json array": '["What is a decorator?", "How does Django\'s ORM build queries?", "When would you add an index?"]',
+    "fenced array": '```json\n["What is a decorator?", "How does Django\'s ORM build queries?", '
+                    '"When would you add an index?"]\n```',
+    "wrapper object": '{"questions": ["What is a decorator?", "How does Django\'s ORM build queries?", '
+                      '"When would you add an index?"]}',
+    "chatty preamble": 'Sure! Here are the questions:\n["What is a decorator?", '
+                       '"How does Django\'s ORM build queries?", "When would you add an index?"]',
+    "question objects": '[{"question": "What is a decorator?"}, {"question": "How does Django\'s ORM build queries?"}, '
+                        '{"question": "When would you add an index?"}]',
+    "numbered lines": "Here you go:\n1. What is a decorator?\n2. How does Django's ORM build queries?\n"
+                      "3. When would you add an index?",
+    "truncated array": '["What is a decorator?", "How does Django\'s ORM build queries?", '
+                       '"When would you add an index?", "Explain the GI',
+}
+
+
+def stream_parse(text, chunk_size):
+    parser = QuestionStreamParser(len(QUESTIONS))
+    questions = []
+    for start in range(0, len(text), chunk_size):
+        questions += parser.feed(text[start:start + chunk_size])
+    return questions + parser.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chunk-sizes", type=int, nargs="+", default=[1, 3, 7, 1000])
+    args = parser.parse_args()
+
+    failures = 0
+    for name, text in CASES.items():
+        results = {"block": parse_question_list(text, len(QUESTIONS))}
+        for chunk_size in args.chunk_sizes:
+            results[f"stream/{chunk_size}"] = stream_parse(text, chunk_size)
+        wrong = {how: got for how, got in results.items() if got != QUESTIONS}
+        failures += bool(wrong)
+        print(f"{'ok' if not wrong else 'MISMATCH':<8}  {name}")
+        for how, got in wrong.items():
+            print(f"          {how}: {got}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Record-then-replay check for the LLM transport, streaming and non-streaming.
+
+Records question generation against the in-process stub, then replays it from the
+cassettes with no network and checks that every call is served from disk with the same
+questions. Run from the repository root:
+
+    python benchmarks/check_transport.py
+
+Exits non-zero if a replayed call misses its cassette or returns different questions.
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stub_server import start_stub_server  # noqa: E402
+
+from llm_client import create_llm_client, with_transport  # noqa: E402
+from question_bank import QuestionBank  # noqa: E402
+from question_cache import QuestionCache  # noqa: E402
+from question_generator import TechnicalQuestionGenerator  # noqa: E402
+from question_index import QuestionIndex  # noqa: E402
+
+STACKS = {
+    "stream": [["Python", "Django"], ["React", "TypeScript"]],
+    "complete": [["Java", "Spring"], ["Go", "PostgreSQL"]]
+}
+
+
+def generate_all(client):
+    """Questions per (call type, stack) from a generator with no cache, bank or shared index"""
+    generator = TechnicalQuestionGenerator(client=client, cache=QuestionCache(path=None, memory_entries=0),
+                                           bank=QuestionBank(), index=QuestionIndex())
+    results = {}
+    for tech_stack in STACKS["stream"]:
+        results[("stream", tuple(tech_stack))] = list(generator.stream_questions(tech_stack, use_cache=False))
+    for tech_stack in STACKS["complete"]:
+        results[("complete", tuple(tech_stack))] = generator.generate_questions(tech_stack, use_cache=False,
+                                                                                fallback=False)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="stub response latency")
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(latency_ms=args.latency_ms)
+    try:
+        with tempfile.TemporaryDirectory() as cassette_dir:
+            recorder = with_transport(create_llm_client(api_key="check", base_url=base_url, max_retries=0),
+                                      "record", cassette_dir)
+            recorded = generate_all(recorder)
+            replayer = with_transport(None, "replay", cassette_dir)
+            replayed = generate_all(replayer)
+    finally:
+        server.shutdown()
+
+    failures = 0
+    for (kind, tech_stack), questions in recorded.items():
+        same = replayed[(kind, tech_stack)] == questions and len(questions) > 0
+        failures += not same
+        print(f"{'ok' if same else 'MISMATCH':<8}  {kind:<8}  {', '.join(tech_stack)}")
+    print(f"recorder {recorder.stats()}, replayer {replayer.stats()}")
+    if replayer.stats()["misses"]:
+        failures += 1
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
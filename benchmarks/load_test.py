@@ -0,0 +1,204 @@
+"""Headless load test: replay candidate transcripts through CandidateScreeningBot.process_stage.
+
+Each line of the transcripts file is a JSON object with a transcript_id and the candidate's
+turns in order, starting at the name prompt. By default an in-process OpenAI-compatible stub
+stands in for Perplexity. Run from the repository root:
+
+    python benchmarks/load_test.py --concurrency 20 --iterations 200 --latency-ms 1500 --jitter-ms 500
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stub_server import start_stub_server  # noqa: E402
+
+from chatbot import CandidateScreeningBot  # noqa: E402
+from llm_client import create_llm_client, with_transport  # noqa: E402
+from llm_transport import TRANSPORT_MODES  # noqa: E402
+from question_bank import QuestionBank  # noqa: E402
+from question_cache import QuestionCache  # noqa: E402
+from question_index import QuestionIndex  # noqa: E402
+from screening_store import ScreeningStore  # noqa: E402
+
+DEFAULT_TRANSCRIPTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "transcripts.jsonl")
+
+
+def load_transcripts(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an unsorted list"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(int(round(pct / 100.0 * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def summarize(values):
+    return {
+        "count": len(values),
+        "mean_ms": sum(values) / len(values) * 1e3 if values else None,
+        "p50_ms": percentile(values, 50) * 1e3 if values else None,
+        "p95_ms": percentile(values, 95) * 1e3 if values else None,
+        "p99_ms": percentile(values, 99) * 1e3 if values else None,
+        "max_ms": max(values) * 1e3 if values else None
+    }
+
+
+class Recorder:
+    """Thread-safe collection of per-stage latencies and outcome counters"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.first_question = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.transcripts = 0
+        self.completed = 0
+        self.question_batches = 0
+        self.fallbacks = 0
+
+    def turn(self, stage, seconds, first_question=None):
+        with self.lock:
+            self.latencies[stage].append(seconds)
+            if first_question is not None:
+                self.first_question[stage].append(first_question)
+
+
+def replay(bot, transcript, recorder, stream):
+    """Drive one candidate through the stage sequence, recording each turn"""
+    candidate_data = {}
+    stage = "collect_name"
+    bot.get_greeting_message()
+
+    for user_input in transcript["turns"]:
+        if stage == "conclusion":
+            break
+        started = time.perf_counter()
+        try:
+            if stream:
+                chunks, next_stage = bot.process_stage_stream(stage, user_input, candidate_data)
+                first_question = None
+                for chunk in chunks:
+                    if first_question is None and chunk.startswith("**1.**"):
+                        first_question = time.perf_counter() - started
+                recorder.turn(stage, time.perf_counter() - started, first_question)
+            else:
+                _, next_stage = bot.process_stage(stage, user_input, candidate_data)
+                recorder.turn(stage, time.perf_counter() - started)
+        except Exception as e:
+            with recorder.lock:
+                recorder.errors[f"{stage}: {type(e).__name__}"] += 1
+            break
+
+        if stage == "collect_tech_stack" and "questions" in candidate_data:
+            fallback = candidate_data["questions"] == bot.question_generator._fallback_questions(candidate_data["tech_stack"])
+            with recorder.lock:
+                recorder.question_batches += 1
+                recorder.fallbacks += int(fallback)
+        stage = next_stage
+
+    with recorder.lock:
+        recorder.transcripts += 1
+        recorder.completed += int(stage == "conclusion")
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--transcripts", default=DEFAULT_TRANSCRIPTS, help="JSONL transcript file")
+    parser.add_argument("--concurrency", type=int, default=10, help="simultaneous candidates")
+    parser.add_argument("--iterations", type=int, default=100, help="total transcripts to replay")
+    parser.add_argument("--stream", action="store_true", help="use process_stage_stream and record time to first question")
+    parser.add_argument("--cache", action="store_true", help="keep an in-memory question cache across candidates")
+    parser.add_argument("--base-url", help="use an existing OpenAI-compatible server instead of the built-in stub")
+    parser.add_argument("--transport", choices=TRANSPORT_MODES, default="live",
+                        help="record LLM calls to cassettes, or replay them with no network")
+    parser.add_argument("--cassette-dir", default="cassettes", help="cassette directory for record/replay")
+    parser.add_argument("--latency-ms", type=float, default=1000.0, help="stub response latency")
+    parser.add_argument("--jitter-ms", type=float, default=250.0, help="stub latency jitter (+/-)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of stub requests that fail")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="load_test_results.json", help="machine-readable results file")
+    args = parser.parse_args()
+
+    transcripts = load_transcripts(args.transcripts)
+    server = None
+    base_url = args.base_url
+    if base_url is None and args.transport != "replay":
+        server, base_url = start_stub_server(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                                             error_rate=args.error_rate, seed=args.seed)
+
+    client = None
+    if args.transport != "replay":
+        # Prefetches and hedged requests run alongside each candidate's own request
+        client = create_llm_client(api_key="load-test", base_url=base_url, max_connections=max(args.concurrency * 3, 10),
+                                   max_keepalive_connections=args.concurrency * 3, max_retries=0)
+    client = with_transport(client, args.transport, args.cassette_dir)
+    bot = CandidateScreeningBot(client=client)
+    bot.question_generator.bank = QuestionBank()
+    bot.question_generator.cache = QuestionCache(path=None, memory_entries=1024 if args.cache else 0)
+    bot.question_generator.index = QuestionIndex()
+    bot.screening_store = ScreeningStore(path=os.path.join(tempfile.mkdtemp(), "screenings.db"))
+
+    recorder = Recorder()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        for i in range(args.iterations):
+            executor.submit(replay, bot, transcripts[i % len(transcripts)], recorder, args.stream)
+    elapsed = time.perf_counter() - started
+    if server is not None:
+        server.shutdown()
+
+    turns = sum(len(values) for values in recorder.latencies.values())
+    results = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "config": {key: value for key, value in vars(args).items() if key != "output"},
+        "elapsed_s": elapsed,
+        "throughput": {
+            "transcripts_per_s": recorder.transcripts / elapsed,
+            "turns_per_s": turns / elapsed
+        },
+        "transcripts": recorder.transcripts,
+        "completed": recorder.completed,
+        "fallback_rate": recorder.fallbacks / recorder.question_batches if recorder.question_batches else 0.0,
+        "errors": dict(recorder.errors),
+        "stages": {stage: summarize(values) for stage, values in recorder.latencies.items()},
+        "first_question": {stage: summarize(values) for stage, values in recorder.first_question.items()}
+    }
+
+    print(f"{recorder.transcripts} transcripts, {turns} turns in {elapsed:.2f}s "
+          f"({results['throughput']['turns_per_s']:.1f} turns/s), fallback rate {results['fallback_rate']:.1%}")
+    print(f"{'stage':<22}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for stage, summary in results["stages"].items():
+        print(f"{stage:<22}{summary['count']:>7}{summary['p50_ms']:>10.1f}{summary['p95_ms']:>10.1f}{summary['p99_ms']:>10.1f}")
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
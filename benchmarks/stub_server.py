@@ -0,0 +1,160 @@
+"""OpenAI-compatible stub server for load tests, with configurable latency, jitter and error rate.
+
+Run from the repository root:
+
+    python benchmarks/stub_server.py --port 8900 --latency-ms 1500 --jitter-ms 500 --error-rate 0.05
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+QUESTIONS = [
+    "Explain how {tech} manages memory and what that means for long-running services.",
+    "How would you structure a medium-sized {tech} project for testability?",
+    "Describe how you would model and index data for a reporting feature backed by {tech}.",
+    "Walk through the time complexity of an algorithm you implemented recently in {tech}.",
+    "How would you diagnose a production latency regression in a {tech} application?",
+]
+
+
+class StubConfig:
+    def __init__(self, latency_ms=1000.0, jitter_ms=0.0, error_rate=0.0, seed=None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+
+    def next_delay(self):
+        with self.lock:
+            self.requests += 1
+            delay = self.latency_ms + self.random.uniform(-self.jitter_ms, self.jitter_ms)
+            fail = self.random.random() < self.error_rate
+            if fail:
+                self.errors += 1
+        return max(delay, 0.0) / 1000.0, fail
+
+
+def _completion_text(messages):
+    """Questions mentioning the first technology named in the prompt, as JSON when the prompt asks for it"""
+    prompt = messages[-1]["content"] if messages else ""
+    tech = "your primary technology"
+    lowered = prompt.lower()
+    if "tech stack:" in lowered:
+        start = lowered.index("tech stack:") + len("tech stack:")
+        tech = prompt[start:].split(",")[0].split("\n")[0].strip().rstrip(".") or tech
+    questions = [question.format(tech=tech) for question in QUESTIONS]
+    if any("JSON" in message["content"] for message in messages):
+        return json.dumps(questions)
+    return "\n".join(f"{i}. {question}" for i, question in enumerate(questions, 1))
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    config = StubConfig()
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": "not found"}})
+            return
+
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        delay, fail = self.config.next_delay()
+        if fail:
+            time.sleep(delay / 4)
+            self._send_json(503, {"error": {"message": "stub injected failure", "type": "server_error"}})
+            return
+
+        text = _completion_text(body.get("messages", []))
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        model = body.get("model", "stub")
+        usage = {"prompt_tokens": 120, "completion_tokens": len(text.split()), "total_tokens": 120 + len(text.split())}
+
+        if body.get("stream"):
+            self._stream(completion_id, model, text, delay)
+            return
+
+        time.sleep(delay)
+        self._send_json(200, {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+            "usage": usage
+        })
+
+    def _stream(self, completion_id, model, text, delay):
+        """Send the completion as server-sent events, spreading the delay across lines"""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+
+        lines = text.split("\n")
+        for i, line in enumerate(lines):
+            time.sleep(delay / len(lines))
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": line + ("\n" if i < len(lines) - 1 else "")},
+                             "finish_reason": None}]
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            self.wfile.flush()
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+        self.close_connection = True
+
+    def _send_json(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(host="127.0.0.1", port=0, latency_ms=1000.0, jitter_ms=0.0, error_rate=0.0, seed=None):
+    """Start the stub in a daemon thread; returns (server, base_url)"""
+    handler = type("ConfiguredStubHandler", (StubHandler,), {
+        "config": StubConfig(latency_ms, jitter_ms, error_rate, seed)
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency-ms", type=float, default=1000.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(args.host, args.port, args.latency_ms, args.jitter_ms,
+                                         args.error_rate, args.seed)
+    print(f"Stub LLM server listening on {base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
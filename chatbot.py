@@ -1,86 +1,29 @@
 import os
-import re
-from dotenv import load_dotenv
-from openai import OpenAI
+import threading
+import uuid
+import metrics
+from config import load_config
 from data_validator import DataValidator
+from intent_classifier import get_intent_classifier
+from prefetch import get_prefetch_pool
+from prompts import QUESTION_COUNT
+from question_generator import TechnicalQuestionGenerator
+from screening_store import get_screening_store, has_answers
+from tech_extractor import TECH_CATEGORIES, get_tech_extractor
 
-load_dotenv()
-
-class TechnicalQuestionGenerator:
-    def __init__(self):
-        self.client = OpenAI(
-            api_key=os.getenv("PERPLEXITY_API_KEY"),
-            base_url="https://api.perplexity.ai"
-        )
-    
-    def generate_questions(self, tech_stack):
-        """Generate 3-5 technical questions based on candidate's tech stack"""
-        
-        prompt = f"""
-        You are an expert technical interviewer. Based on the candidate's tech stack: {', '.join(tech_stack)}, 
-        generate exactly 5 technical interview questions that assess:
-        
-        1. Core programming concepts in their primary language
-        2. Framework/library specific knowledge
-        3. Database and data handling skills
-        4. Problem-solving and algorithms
-        5. Real-world application scenarios
-        
-        Format your response as a numbered list with clear, specific questions.
-        Each question should be appropriate for assessing proficiency in the mentioned technologies.
-        """
-        
-        try:
-            response = self.client.chat.completions.create(
-                model="llama-3.1-sonar-large-128k-online",
-                messages=[
-                    {"role": "system", "content": "You are a technical interviewer creating relevant assessment questions."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=800
-            )
-            
-            questions = response.choices[0].message.content.strip()
-            return self._parse_questions(questions)
-            
-        except Exception as e:
-            print(f"API Error: {e}")
-            return self._fallback_questions(tech_stack)
-    
-    def _parse_questions(self, questions_text):
-        """Parse numbered questions from response"""
-        lines = questions_text.split('\n')
-        questions = []
-        
-        for line in lines:
-            line = line.strip()
-            if re.match(r'^\d+\.\s+', line):
-                question = re.sub(r'^\d+\.\s+', '', line)
-                questions.append(question)
-        
-        return questions[:5]  # Ensure max 5 questions
-    
-    def _fallback_questions(self, tech_stack):
-        """Fallback questions when API fails"""
-        base_questions = [
-            f"Explain the key features and use cases of {tech_stack[0] if tech_stack else 'your primary technology'}.",
-            "Describe a challenging project you've worked on and how you overcame technical obstacles.",
-            "How do you approach debugging complex issues in your applications?",
-            "What are the best practices you follow for code quality and maintainability?",
-            "Explain how you would optimize the performance of a slow-running application."
-        ]
-        return base_questions
-
+load_config()
 
 class CandidateScreeningBot:
-    def __init__(self):
-        self.client = OpenAI(
-            api_key=os.getenv("PERPLEXITY_API_KEY"),
-            base_url="https://api.perplexity.ai"
-        )
+    # Shown when every question available for the stack has already been asked
+    NO_NEW_QUESTIONS_MESSAGE = "I don't have any new questions for your tech stack beyond the ones you've seen.\n\n"
+    
+    def __init__(self, client=None):
         self.validator = DataValidator()
-        self.question_generator = TechnicalQuestionGenerator()
+        self.question_generator = TechnicalQuestionGenerator(client=client)
+        self.prefetch_pool = get_prefetch_pool()
+        metrics.registry.register_collector("prefetch", self.prefetch_pool.stats)
+        self.screening_store = get_screening_store()
+        metrics.registry.register_collector("screening_store", self.screening_store.stats)
         
         # Conversation stages
         self.stages = [
@@ -96,25 +39,36 @@ class CandidateScreeningBot:
             "conclusion"
         ]
         
-        # Exit keywords
-        self.exit_keywords = [
-            "quit", "exit", "bye", "goodbye", "end", "stop", 
-            "terminate", "close", "finish", "done"
-        ]
+        # Exit keywords and per-stage validation, compiled once per process
+        self.classifier = get_intent_classifier()
         
         # Tech stack categories for better parsing
-        self.tech_categories = {
-            "Programming Languages": ["python", "java", "javascript", "typescript", "c++", "c#", "go", "rust", "php", "ruby", "swift", "kotlin"],
-            "Frontend": ["react", "vue", "angular", "html", "css", "bootstrap", "tailwind"],
-            "Backend": ["django", "flask", "fastapi", "express", "spring", "laravel", ".net"],
-            "Databases": ["mysql", "postgresql", "mongodb", "redis", "sqlite", "oracle"],
-            "Cloud & DevOps": ["aws", "azure", "gcp", "docker", "kubernetes", "jenkins", "git"],
-            "AI/ML": ["tensorflow", "pytorch", "scikit-learn", "opencv", "pandas", "numpy"]
-        }
+        self.tech_categories = TECH_CATEGORIES
+        self.tech_extractor = get_tech_extractor()
+        
+        # Lazy startup defers the LLM client and question index to the first request that needs them;
+        # background startup builds them while the first candidates are still entering contact details
+        startup_mode = os.getenv("STARTUP_MODE", "lazy")
+        if startup_mode == "eager":
+            self.warm_up()
+        elif startup_mode == "background":
+            threading.Thread(target=self.warm_up, name="warm-up", daemon=True).start()
+    
+    @property
+    def client(self):
+        return self.question_generator.client
+    
+    @property
+    def question_index(self):
+        return self.question_generator.index
+    
+    def warm_up(self):
+        """Do the deferred startup work now, e.g. before a replica starts taking traffic"""
+        self.question_generator.warm_up()
     
     def check_exit_intent(self, user_input):
         """Check if user wants to exit conversation"""
-        return any(keyword in user_input.lower() for keyword in self.exit_keywords)
+        return self.classifier.is_exit(user_input)
     
     def get_greeting_message(self):
         """Initial greeting and overview"""
@@ -136,34 +90,41 @@ class CandidateScreeningBot:
     
     def process_stage(self, stage, user_input, candidate_data):
         """Process each conversation stage"""
-        
-        if self.check_exit_intent(user_input):
+        with metrics.timer("stage_duration_seconds", stage=stage):
+            return self._process_stage(stage, user_input, candidate_data)
+    
+    def _process_stage(self, stage, user_input, candidate_data):
+        """Handle one stage and return (response, next_stage)"""
+        exit_intent, valid, value = self.classifier.classify(stage, user_input)
+        if exit_intent:
+            self._cancel_prefetch(candidate_data)
+            self.record_screening(candidate_data)
             return self.get_goodbye_message(), "conclusion"
         
         if stage == "collect_name":
-            if self.validator.validate_name(user_input):
-                candidate_data["name"] = user_input.strip()
+            if valid:
+                candidate_data["name"] = value
                 return f"Nice to meet you, {candidate_data['name']}! **What's your email address?**", "collect_email"
             else:
                 return "Please provide a valid full name (at least 2 characters, letters only).", "collect_name"
         
         elif stage == "collect_email":
-            if self.validator.validate_email(user_input.strip()):
-                candidate_data["email"] = user_input.strip()
+            if valid:
+                candidate_data["email"] = value
                 return "Great! **What's your phone number?**", "collect_phone"
             else:
                 return "Please provide a valid email address.", "collect_email"
         
         elif stage == "collect_phone":
-            if self.validator.validate_phone(user_input.strip()):
-                candidate_data["phone"] = user_input.strip()
+            if valid:
+                candidate_data["phone"] = value
                 return "Perfect! **How many years of professional experience do you have?** (Enter a number)", "collect_experience"
             else:
                 return "Please provide a valid phone number.", "collect_phone"
         
         elif stage == "collect_experience":
-            if self.validator.validate_experience(user_input.strip()):
-                candidate_data["experience"] = float(user_input.strip())
+            if valid:
+                candidate_data["experience"] = value
                 return "Thank you! **What position(s) are you interested in applying for?**", "collect_position"
             else:
                 return "Please enter a valid number of years (0-50).", "collect_experience"
@@ -193,6 +154,7 @@ class CandidateScreeningBot:
             
             questions = self.question_generator.generate_questions(tech_stack)
             candidate_data["questions"] = questions
+            self._prefetch_more_questions(candidate_data)
             
             response = f"""
             **Excellent! Based on your tech stack: {', '.join(tech_stack)}**
@@ -213,38 +175,189 @@ class CandidateScreeningBot:
         elif stage == "technical_questions":
             user_response = user_input.lower().strip()
             if "more" in user_response:
-                # Generate additional questions
-                additional_questions = self.question_generator.generate_questions(candidate_data["tech_stack"])
+                # Use the prefetched batch if it is ready, otherwise generate now
+                additional_questions = self._take_more_questions(candidate_data)
+                self._prefetch_more_questions(candidate_data)
                 
                 response = "**Here are 5 additional technical questions:**\n\n"
                 for i, question in enumerate(additional_questions, 1):
                     response += f"**{i}.** {question}\n\n"
+                if not additional_questions:
+                    response = self.NO_NEW_QUESTIONS_MESSAGE
                 
                 response += "Ready to conclude? Type 'finish' when you're done."
                 return response, "technical_questions"
             else:
+                self._cancel_prefetch(candidate_data)
+                self.record_screening(candidate_data, "completed")
                 return self.get_conclusion_message(candidate_data), "conclusion"
         
         # Fallback for unexpected inputs
         return self.get_fallback_response(stage), stage
     
+    def process_stage_stream(self, stage, user_input, candidate_data):
+        """Process a stage, returning the response as a generator of text chunks"""
+        if not self.check_exit_intent(user_input):
+            if stage == "collect_tech_stack":
+                tech_stack = self._parse_tech_stack(user_input)
+                candidate_data["tech_stack"] = tech_stack
+                chunks = self._stream_questions_response(tech_stack, candidate_data)
+                return self._timed_stream(stage, chunks), "technical_questions"
+            
+            if stage == "technical_questions" and "more" in user_input.lower().strip():
+                chunks = self._stream_more_questions_response(candidate_data)
+                return self._timed_stream(stage, chunks), "technical_questions"
+        
+        response, next_stage = self.process_stage(stage, user_input, candidate_data)
+        return iter([response]), next_stage
+    
+    def _timed_stream(self, stage, chunks):
+        """Observe the stage duration once a streamed response has been fully consumed"""
+        with metrics.timer("stage_duration_seconds", stage=stage):
+            yield from chunks
+    
+    def _stream_questions_response(self, tech_stack, candidate_data):
+        """Yield the first batch of questions as they are generated"""
+        candidate_data["questions"] = []
+        yield f"**Excellent! Based on your tech stack: {', '.join(tech_stack)}**\n\n"
+        yield "Here are technical questions tailored to your skills:\n\n"
+        
+        for i, question in enumerate(self.question_generator.stream_questions(tech_stack), 1):
+            candidate_data["questions"].append(question)
+            yield f"**{i}.** {question}\n\n"
+        
+        self._prefetch_more_questions(candidate_data)
+        yield "These questions assess your proficiency in the technologies you've mentioned."
+    
+    def _stream_more_questions_response(self, candidate_data):
+        """Yield an additional batch of questions as they are generated"""
+        yield "**Here are additional technical questions:**\n\n"
+        
+        future = self.prefetch_pool.take(candidate_data.get("_prefetch_key"))
+        if (future is not None and not future.cancelled()) or self._indexed_questions(candidate_data):
+            questions = self._take_more_questions(candidate_data, future)
+        else:
+            questions = self._stream_unseen_questions(candidate_data)
+        
+        shown = 0
+        for shown, question in enumerate(questions, 1):
+            yield f"**{shown}.** {question}\n\n"
+        if not shown:
+            yield self.NO_NEW_QUESTIONS_MESSAGE
+        
+        self._prefetch_more_questions(candidate_data)
+        yield "Ready to conclude? Type 'finish' when you're done."
+    
+    def record_screening(self, candidate_data, status=None):
+        """Hand a finished or abandoned screening to the write-behind store, once"""
+        if not has_answers(candidate_data) or candidate_data.get("_recorded"):
+            return
+        if status is None:
+            status = "completed" if candidate_data.get("questions") else "abandoned"
+        self.screening_store.submit(candidate_data, status)
+        candidate_data["_recorded"] = True
+    
+    def _prefetch_more_questions(self, candidate_data):
+        """Start generating the next "more" batch in the background, unless the index can already serve it"""
+        self._cancel_prefetch(candidate_data)
+        if self._indexed_questions(candidate_data):
+            return
+        key = uuid.uuid4().hex
+        if self.prefetch_pool.submit(key, self.question_generator.generate_questions,
+                                     candidate_data["tech_stack"], use_cache=False):
+            candidate_data["_prefetch_key"] = key
+    
+    def _take_more_questions(self, candidate_data, future=None):
+        """Return a batch the candidate has not seen: from the index, the prefetched batch, or generated on the spot"""
+        if future is None:
+            future = self.prefetch_pool.take(candidate_data.get("_prefetch_key"))
+        candidate_data.pop("_prefetch_key", None)
+        
+        seen = self._seen_questions(candidate_data)
+        indexed = self._indexed_questions(candidate_data)
+        if indexed:
+            if future is not None:
+                future.cancel()
+            metrics.inc("question_index_batches_total", source="index")
+            return self._remember_questions(candidate_data, indexed)
+        
+        batch = None
+        if future is not None and not future.cancelled():
+            try:
+                batch = future.result()
+            except Exception as e:
+                print(f"Prefetch Error: {e}")
+        if batch is None:
+            batch = self.question_generator.generate_questions(candidate_data["tech_stack"], use_cache=False)
+        
+        # Drop repeats of earlier questions and top up from the index
+        questions = self.question_index.filter_unseen(batch, seen)
+        metrics.inc("question_duplicates_dropped_total", len(batch) - len(questions))
+        if len(questions) < QUESTION_COUNT:
+            questions += self.question_index.lookup(candidate_data["tech_stack"], seen + questions,
+                                                    QUESTION_COUNT - len(questions))
+        if not questions:
+            # Everything was a repeat; generic questions beat showing the same ones again, and none beats repeats
+            questions = self.question_index.filter_unseen(
+                self.question_generator._fallback_questions(candidate_data["tech_stack"]), seen)
+        metrics.inc("question_index_batches_total", source="model")
+        return self._remember_questions(candidate_data, questions)
+    
+    def _stream_unseen_questions(self, candidate_data):
+        """Stream a new batch, skipping repeats of earlier questions and topping up from the index"""
+        seen = self._seen_questions(candidate_data)
+        shown = []
+        for question in self.question_generator.stream_questions(candidate_data["tech_stack"], use_cache=False):
+            if self.question_index.filter_unseen([question], seen + shown):
+                shown.append(question)
+                yield question
+            else:
+                metrics.inc("question_duplicates_dropped_total")
+        
+        for question in self.question_index.lookup(candidate_data["tech_stack"], seen + shown,
+                                                   QUESTION_COUNT - len(shown)):
+            shown.append(question)
+            yield question
+        if not shown:
+            for question in self.question_index.filter_unseen(
+                    self.question_generator._fallback_questions(candidate_data["tech_stack"]), seen):
+                shown.append(question)
+                yield question
+        self._remember_questions(candidate_data, shown)
+    
+    def _indexed_questions(self, candidate_data):
+        """A full batch of unseen questions from the index, or None"""
+        questions = self.question_index.lookup(candidate_data["tech_stack"], self._seen_questions(candidate_data),
+                                               QUESTION_COUNT)
+        return questions if len(questions) >= QUESTION_COUNT else None
+    
+    def _seen_questions(self, candidate_data):
+        return candidate_data.get("questions", []) + candidate_data.get("_more_questions", [])
+    
+    def _remember_questions(self, candidate_data, questions):
+        candidate_data.setdefault("_more_questions", []).extend(questions)
+        return questions
+    
+    def _cancel_prefetch(self, candidate_data):
+        """Discard any background batch once it can no longer be used"""
+        key = candidate_data.pop("_prefetch_key", None)
+        if key is not None:
+            self.prefetch_pool.cancel(key)
+    
     def _parse_tech_stack(self, tech_input):
         """Parse and categorize technical skills from user input"""
-        # Clean and split the input
-        tech_items = [item.strip().lower() for item in re.split(r'[,;]', tech_input)]
-        tech_items = [item for item in tech_items if len(item) > 1]
-        
-        # Match with known technologies
         matched_tech = []
-        for item in tech_items:
-            # Direct matching
-            for category, techs in self.tech_categories.items():
-                if item in techs:
-                    matched_tech.append(item.title())
-                    break
+        for item, technologies in self.tech_extractor.parse_items(tech_input):
+            if technologies:
+                # Known technologies and their aliases, in canonical spelling
+                names = [self.tech_extractor.display_name(tech) for tech in technologies]
             else:
-                # Partial matching for common variations
-                matched_tech.append(item.title())
+                # Keep unrecognized items so niche technologies still reach the question prompt
+                names = [item.title()]
+            
+            for name in names:
+                if name.lower() not in {tech.lower() for tech in matched_tech}:
+                    matched_tech.append(name)
         
         return matched_tech[:10]  # Limit to 10 items
     
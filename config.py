@@ -0,0 +1,14 @@
+import threading
+
+_loaded = False
+_load_lock = threading.Lock()
+
+
+def load_config():
+    """Load .env into the environment once per process; later calls are no-ops"""
+    global _loaded
+    with _load_lock:
+        if not _loaded:
+            from dotenv import load_dotenv
+            load_dotenv()
+            _loaded = True
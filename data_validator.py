@@ -1,17 +1,22 @@
 import re
 
+EMAIL_PATTERN = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+NAME_PATTERN = r'^[a-zA-Z\s]+$'
+EMAIL_RE = re.compile(EMAIL_PATTERN)
+NAME_RE = re.compile(NAME_PATTERN)
+NON_DIGIT_RE = re.compile(r'\D')
+
 class DataValidator:
     @staticmethod
     def validate_email(email):
         """Simple email validation using regex"""
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return re.match(pattern, email.strip()) is not None
+        return EMAIL_RE.match(email.strip()) is not None
     
     @staticmethod
     def validate_phone(phone):
         """Simple phone validation - accepts various formats"""
         # Remove all non-digit characters
-        digits_only = re.sub(r'\D', '', phone)
+        digits_only = NON_DIGIT_RE.sub('', phone)
         # Check if it has 10-15 digits (international phone numbers)
         return 10 <= len(digits_only) <= 15
     
@@ -19,7 +24,7 @@ class DataValidator:
     def validate_name(name):
         """Validate name - at least 2 characters, letters and spaces only"""
         name = name.strip()
-        return len(name) >= 2 and re.match(r'^[a-zA-Z\s]+$', name)
+        return len(name) >= 2 and NAME_RE.match(name)
     
     @staticmethod
     def validate_experience(experience):
@@ -29,3 +34,29 @@ class DataValidator:
             return 0 <= years <= 50
         except:
             return False
+    
+    # Vectorized versions of the checks above for pandas Series; missing values are invalid
+    
+    @staticmethod
+    def validate_emails(emails):
+        """Boolean Series: validate_email for every value"""
+        return emails.fillna("").astype(str).str.strip().str.match(EMAIL_PATTERN)
+    
+    @staticmethod
+    def validate_phones(phones):
+        """Boolean Series: validate_phone for every value"""
+        return phones.fillna("").astype(str).str.count(r'\d').between(10, 15)
+    
+    @staticmethod
+    def validate_names(names):
+        """Boolean Series: validate_name for every value"""
+        names = names.fillna("").astype(str).str.strip()
+        return (names.str.len() >= 2) & names.str.match(NAME_PATTERN)
+    
+    @staticmethod
+    def validate_experiences(experiences):
+        """Boolean Series: validate_experience for every value"""
+        import pandas as pd
+        
+        years = pd.to_numeric(experiences.astype(str).str.strip(), errors="coerce")
+        return years.between(0, 50)
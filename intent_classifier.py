@@ -0,0 +1,80 @@
+import re
+import threading
+
+from data_validator import EMAIL_RE, NAME_RE, NON_DIGIT_RE
+
+EXIT_KEYWORDS = ("quit", "exit", "bye", "goodbye", "end", "stop", "terminate", "close", "finish", "done")
+
+WHITESPACE_RE = re.compile(r'\s+')
+
+
+class IntentClassifier:
+    """Precompiled per-turn classifier: exit intent plus the current stage's validation and normalized value"""
+
+    def __init__(self, exit_keywords=EXIT_KEYWORDS):
+        # Whole words only, so "frontend" or "end-to-end" are not read as "end"; longest keyword first
+        keywords = sorted((re.escape(keyword) for keyword in exit_keywords), key=len, reverse=True)
+        self.exit_pattern = re.compile(rf"(?<![\w-])(?:{'|'.join(keywords)})(?![\w-])", re.IGNORECASE)
+        self._normalizers = {
+            "collect_name": self.normalize_name,
+            "collect_email": self.normalize_email,
+            "collect_phone": self.normalize_phone,
+            "collect_experience": self.normalize_experience
+        }
+
+    def is_exit(self, text):
+        return self.exit_pattern.search(text) is not None
+
+    def classify(self, stage, text):
+        """Return (exit_intent, valid, value); value is the normalized input, None when it is invalid"""
+        if self.is_exit(text):
+            return True, False, None
+        text = text.strip()
+        normalize = self._normalizers.get(stage)
+        if normalize is None:
+            return False, True, text
+        value = normalize(text)
+        return False, value is not None, value
+
+    @staticmethod
+    def normalize_name(text):
+        """At least 2 characters, letters and spaces only, with runs of whitespace collapsed"""
+        if len(text) < 2 or not NAME_RE.match(text):
+            return None
+        return WHITESPACE_RE.sub(" ", text)
+
+    @staticmethod
+    def normalize_email(text):
+        """The address with its domain lowercased"""
+        if not EMAIL_RE.match(text):
+            return None
+        local, domain = text.rsplit("@", 1)
+        return f"{local}@{domain.lower()}"
+
+    @staticmethod
+    def normalize_phone(text):
+        """Digits only, 10-15 of them"""
+        digits = NON_DIGIT_RE.sub("", text)
+        return digits if 10 <= len(digits) <= 15 else None
+
+    @staticmethod
+    def normalize_experience(text):
+        """Years of experience as a float between 0 and 50"""
+        try:
+            years = float(text)
+        except ValueError:
+            return None
+        return years if 0 <= years <= 50 else None
+
+
+_default_classifier = None
+_default_classifier_lock = threading.Lock()
+
+
+def get_intent_classifier():
+    """Return the process-wide classifier, compiled once"""
+    global _default_classifier
+    with _default_classifier_lock:
+        if _default_classifier is None:
+            _default_classifier = IntentClassifier()
+        return _default_classifier
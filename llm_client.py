@@ -0,0 +1,86 @@
+import os
+import threading
+
+from llm_transport import CassetteClient
+
+PERPLEXITY_BASE_URL = "https://api.perplexity.ai"
+# Both expose the OpenAI chat.completions interface the question generator calls
+LLM_BACKENDS = ("openai", "perplexity")
+
+
+def create_llm_client(api_key=None, base_url=None, max_connections=100, max_keepalive_connections=20,
+                      keepalive_expiry=30.0, timeout=30.0, connect_timeout=5.0, max_retries=2):
+    """Create an OpenAI-compatible client with a tuned, reusable connection pool"""
+    # openai takes most of a second to import, so it is only loaded once a client is needed
+    import httpx
+    from openai import DefaultHttpxClient, OpenAI, Timeout
+
+    http_client = DefaultHttpxClient(
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+    )
+    return OpenAI(
+        api_key=api_key or os.getenv("PERPLEXITY_API_KEY"),
+        base_url=base_url or PERPLEXITY_BASE_URL,
+        http_client=http_client,
+        timeout=Timeout(timeout, connect=connect_timeout),
+        max_retries=max_retries
+    )
+
+
+def create_perplexity_client(api_key=None, timeout=30.0, max_retries=2):
+    """Create a client with the official perplexity SDK"""
+    try:
+        from perplexity import Perplexity
+    except ImportError:
+        raise ImportError("LLM_BACKEND=perplexity needs the perplexity SDK: pip install perplexityai")
+    return Perplexity(
+        api_key=api_key or os.getenv("PERPLEXITY_API_KEY"),
+        timeout=timeout,
+        max_retries=max_retries
+    )
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def with_transport(client, mode="live", cassette_dir="cassettes"):
+    """Wrap a client for record/replay; live mode returns it unchanged"""
+    if mode == "live":
+        return client
+    return CassetteClient(mode, cassette_dir, client)
+
+
+def get_llm_client():
+    """Return the process-wide LLM client, configured from the environment"""
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            mode = os.getenv("LLM_TRANSPORT", "live")
+            backend = os.getenv("LLM_BACKEND", "openai")
+            if backend not in LLM_BACKENDS:
+                raise ValueError(f"Unknown LLM_BACKEND {backend!r}; expected one of {', '.join(LLM_BACKENDS)}")
+            # Replay serves everything from disk, so no network client is needed
+            if mode == "replay":
+                client = None
+            elif backend == "perplexity":
+                client = create_perplexity_client(
+                    timeout=float(os.getenv("LLM_TIMEOUT_SECONDS", 30)),
+                    max_retries=int(os.getenv("LLM_MAX_RETRIES", 0))
+                )
+            else:
+                client = create_llm_client(
+                    base_url=os.getenv("LLM_BASE_URL", PERPLEXITY_BASE_URL),
+                    max_connections=int(os.getenv("LLM_MAX_CONNECTIONS", 100)),
+                    max_keepalive_connections=int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", 20)),
+                    keepalive_expiry=float(os.getenv("LLM_KEEPALIVE_EXPIRY_SECONDS", 30)),
+                    timeout=float(os.getenv("LLM_TIMEOUT_SECONDS", 30)),
+                    connect_timeout=float(os.getenv("LLM_CONNECT_TIMEOUT_SECONDS", 5)),
+                    max_retries=int(os.getenv("LLM_MAX_RETRIES", 0))
+                )
+            _default_client = with_transport(client, mode, os.getenv("LLM_CASSETTE_DIR", "cassettes"))
+        return _default_client
@@ -0,0 +1,170 @@
+import hashlib
+import json
+import os
+import threading
+from types import SimpleNamespace
+
+TRANSPORT_MODES = ("live", "record", "replay")
+
+
+class CassetteMissError(LookupError):
+    """Raised in replay mode when no recording exists for a request"""
+
+
+def request_key(params):
+    """Hash of model, messages and generation parameters; streaming and non-streaming calls share a key"""
+    relevant = {key: value for key, value in params.items() if key not in ("stream", "stream_options", "timeout")}
+    payload = json.dumps(relevant, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class _Completions:
+    def __init__(self, transport):
+        self._transport = transport
+
+    def create(self, **params):
+        return self._transport.create(**params)
+
+
+class CassetteClient:
+    """OpenAI-compatible client wrapper that records chat completions to disk or replays them"""
+
+    def __init__(self, mode, cassette_dir, client=None):
+        if mode not in TRANSPORT_MODES:
+            raise ValueError(f"Unknown LLM transport mode {mode!r}; expected one of {', '.join(TRANSPORT_MODES)}")
+        if mode != "replay" and client is None:
+            raise ValueError(f"LLM transport mode {mode!r} needs an underlying client")
+
+        self.mode = mode
+        self.cassette_dir = cassette_dir
+        self.client = client
+        self.chat = SimpleNamespace(completions=_Completions(self))
+        self._lock = threading.Lock()
+        self._stats = {"recorded": 0, "replayed": 0, "misses": 0}
+        os.makedirs(cassette_dir, exist_ok=True)
+
+    def create(self, **params):
+        """chat.completions.create with the configured transport"""
+        if self.mode == "live":
+            return self.client.chat.completions.create(**params)
+
+        key = request_key(params)
+        if self.mode == "replay":
+            cassette = self._load(key)
+            if cassette is None:
+                self._count("misses")
+                raise CassetteMissError(f"No cassette recorded for request {key[:12]}")
+            self._count("replayed")
+            response = cassette["response"]
+            return self._as_stream(response) if params.get("stream") else self._as_completion(response)
+
+        response = self.client.chat.completions.create(**params)
+        if params.get("stream"):
+            return self._record_stream(key, params, response)
+
+        choice = response.choices[0]
+        self._save(key, params, {
+            "id": getattr(response, "id", None),
+            "model": getattr(response, "model", params.get("model")),
+            "content": choice.message.content,
+            "finish_reason": getattr(choice, "finish_reason", "stop"),
+            "usage": self._usage_dict(getattr(response, "usage", None))
+        })
+        return response
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats)
+
+    def _record_stream(self, key, params, stream):
+        """Pass chunks through to the caller and save the assembled reply once the stream ends or is closed"""
+        parts = []
+        usage = None
+        finish_reason = "stop"
+        try:
+            for chunk in stream:
+                if getattr(chunk, "usage", None) is not None:
+                    usage = self._usage_dict(chunk.usage)
+                if chunk.choices:
+                    parts.append(chunk.choices[0].delta.content or "")
+                    finish_reason = chunk.choices[0].finish_reason or finish_reason
+                yield chunk
+        except GeneratorExit:
+            # The caller stopped reading once it had what it needed; replay must serve exactly what it saw
+            getattr(stream, "close", lambda: None)()
+            if parts:
+                self._save_stream(key, params, parts, finish_reason, usage)
+            raise
+        self._save_stream(key, params, parts, finish_reason, usage)
+
+    def _save_stream(self, key, params, parts, finish_reason, usage):
+        self._save(key, params, {
+            "id": None,
+            "model": params.get("model"),
+            "content": "".join(parts),
+            "finish_reason": finish_reason,
+            "usage": usage
+        })
+
+    def _path(self, key):
+        return os.path.join(self.cassette_dir, f"{key}.json")
+
+    def _load(self, key):
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _save(self, key, params, response):
+        cassette = {
+            "request": {name: value for name, value in params.items() if name != "timeout"},
+            "response": response
+        }
+        # Write then rename so concurrent readers never see a partial cassette
+        tmp_path = f"{self._path(key)}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(cassette, f, ensure_ascii=False, indent=2, default=str)
+        os.replace(tmp_path, self._path(key))
+        self._count("recorded")
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    @staticmethod
+    def _usage_dict(usage):
+        if usage is None:
+            return None
+        return {name: getattr(usage, name, None) for name in ("prompt_tokens", "completion_tokens", "total_tokens")}
+
+    @staticmethod
+    def _as_completion(response):
+        usage = response.get("usage")
+        return SimpleNamespace(
+            id=response.get("id"),
+            model=response.get("model"),
+            choices=[SimpleNamespace(
+                index=0,
+                message=SimpleNamespace(role="assistant", content=response["content"]),
+                finish_reason=response.get("finish_reason", "stop")
+            )],
+            usage=SimpleNamespace(**usage) if usage else None
+        )
+
+    @staticmethod
+    def _as_stream(response):
+        """Replay a recorded reply as one chunk per line"""
+        lines = response["content"].splitlines(keepends=True) or [""]
+        for i, line in enumerate(lines):
+            last = i == len(lines) - 1
+            yield SimpleNamespace(
+                id=response.get("id"),
+                model=response.get("model"),
+                choices=[SimpleNamespace(
+                    index=0,
+                    delta=SimpleNamespace(role="assistant", content=line),
+                    finish_reason=response.get("finish_reason", "stop") if last else None
+                )],
+                usage=None
+            )
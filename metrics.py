@@ -0,0 +1,254 @@
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config import load_config
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+TOKEN_BUCKETS = (16, 32, 64, 128, 256, 512, 1024, 2048, 4096)
+
+logger = logging.getLogger("hiring_chatbot.metrics")
+
+
+class _Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class _NullTimer:
+    """Shared no-op context manager handed out while metrics are disabled"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    def __init__(self, registry, name, labels):
+        self.registry = registry
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.registry.observe(self.name, time.perf_counter() - self.started, **self.labels)
+        return False
+
+
+class MetricsRegistry:
+    """In-process counters, gauges and histograms with Prometheus text and JSON snapshots"""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._help = {}
+        self._types = {}
+        self._buckets = {}
+        self._series = {}
+        self._collectors = {}
+
+    def define(self, name, kind, help_text, buckets=None):
+        """Declare a metric; kind is counter, gauge or histogram"""
+        self._help[name] = help_text
+        self._types[name] = kind
+        if kind == "histogram":
+            self._buckets[name] = tuple(buckets or LATENCY_BUCKETS)
+
+    def register_collector(self, prefix, fn):
+        """Sample fn() -> {name: number} as gauges named prefix_name at export time"""
+        self._collectors[prefix] = fn
+
+    def inc(self, name, amount=1, **labels):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+
+    def set(self, name, value, **labels):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._series[(name, tuple(sorted(labels.items())))] = value
+
+    def observe(self, name, value, **labels):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._series.get(key)
+            if histogram is None:
+                histogram = self._series[key] = _Histogram(self._buckets.get(name, LATENCY_BUCKETS))
+            histogram.observe(value)
+
+    def timer(self, name, **labels):
+        """Context manager observing elapsed seconds into a histogram"""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name, labels)
+
+    def snapshot(self):
+        """Return every series as plain data, suitable for JSON logging"""
+        with self._lock:
+            series = list(self._series.items())
+        data = {}
+        for (name, labels), value in series:
+            entry = {"labels": dict(labels)}
+            if isinstance(value, _Histogram):
+                entry.update(count=value.count, sum=value.sum,
+                             buckets=dict(zip([str(b) for b in value.buckets] + ["+Inf"], value.counts)))
+            else:
+                entry["value"] = value
+            data.setdefault(name, []).append(entry)
+        for prefix, values in self._collected():
+            for key, value in values.items():
+                data[f"{prefix}_{key}"] = [{"labels": {}, "value": value}]
+        return data
+
+    def render_prometheus(self):
+        """Render all series in the Prometheus text exposition format"""
+        with self._lock:
+            series = sorted(self._series.items(), key=lambda item: (item[0][0], str(item[0][1])))
+        lines = []
+        described = set()
+        for (name, labels), value in series:
+            if name not in described:
+                described.add(name)
+                lines.append(f"# HELP {name} {self._help.get(name, name)}")
+                lines.append(f"# TYPE {name} {self._types.get(name, 'untyped')}")
+            if isinstance(value, _Histogram):
+                cumulative = 0
+                for bound, count in zip(list(value.buckets) + ["+Inf"], value.counts):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_labels(labels + (('le', bound),))} {cumulative}")
+                lines.append(f"{name}_sum{_labels(labels)} {value.sum}")
+                lines.append(f"{name}_count{_labels(labels)} {value.count}")
+            else:
+                lines.append(f"{name}{_labels(labels)} {value}")
+        for prefix, values in self._collected():
+            for key, value in values.items():
+                if isinstance(value, (int, float)):
+                    lines.append(f"# TYPE {prefix}_{key} gauge")
+                    lines.append(f"{prefix}_{key} {value}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+    def _collected(self):
+        for prefix, fn in list(self._collectors.items()):
+            try:
+                yield prefix, fn()
+            except Exception as e:
+                logger.warning("Metrics collector %s failed: %s", prefix, e)
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{str(value)}"' for key, value in labels) + "}"
+
+
+load_config()
+registry = MetricsRegistry(enabled=os.getenv("METRICS_ENABLED", "false").lower() in ("1", "true", "yes"))
+
+registry.define("stage_duration_seconds", "histogram", "Time spent processing a conversation stage")
+registry.define("llm_request_duration_seconds", "histogram", "Latency of LLM chat completion requests")
+registry.define("llm_requests_total", "counter", "LLM chat completion requests by outcome")
+registry.define("llm_prompt_tokens", "histogram", "Prompt tokens reported per LLM response", TOKEN_BUCKETS)
+registry.define("llm_completion_tokens", "histogram", "Completion tokens reported per LLM response", TOKEN_BUCKETS)
+registry.define("llm_retries_total", "counter", "LLM requests retried after a transient error")
+registry.define("llm_rate_limit_wait_seconds", "histogram", "Time LLM requests waited for the shared rate limiter")
+registry.define("llm_hedges_total", "counter", "Hedged requests sent to the main model because the fast tier was slow or failed")
+registry.define("question_slo_wins_total", "counter", "Question batches served within the latency SLO, by winning tier")
+registry.define("question_slo_latency_seconds", "histogram", "Time to questions under the latency SLO, by winning tier")
+registry.define("question_index_batches_total", "counter", "Additional question batches by source (index or model)")
+registry.define("question_duplicates_dropped_total", "counter", "Generated questions dropped as near-duplicates of ones the candidate already saw")
+registry.define("question_parse_duration_seconds", "histogram", "Time spent parsing questions from a reply")
+registry.define("question_parse_repairs_total", "counter", "Replies that needed repair before their questions could be parsed")
+registry.define("question_fallbacks_total", "counter", "Times generic or banked fallback questions were served")
+
+inc = registry.inc
+set_gauge = registry.set
+observe = registry.observe
+timer = registry.timer
+
+
+class _PrometheusHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = registry.render_prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_prometheus_server(port, host="0.0.0.0"):
+    """Serve /metrics on a daemon thread"""
+    server = ThreadingHTTPServer((host, port), _PrometheusHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+def start_json_logger(interval_seconds):
+    """Log a structured JSON snapshot every interval_seconds on a daemon thread"""
+    if not logger.handlers:
+        logger.addHandler(logging.StreamHandler())
+        logger.setLevel(logging.INFO)
+
+    def run():
+        while True:
+            time.sleep(interval_seconds)
+            logger.info(json.dumps({"ts": time.time(), "metrics": registry.snapshot()}, default=str))
+
+    thread = threading.Thread(target=run, name="metrics-log", daemon=True)
+    thread.start()
+    return thread
+
+
+_exporters_started = False
+_exporters_lock = threading.Lock()
+
+
+def start_exporters():
+    """Start the exporters configured by METRICS_PORT and METRICS_LOG_INTERVAL_SECONDS, once per process"""
+    global _exporters_started
+    with _exporters_lock:
+        if _exporters_started or not registry.enabled:
+            return
+        _exporters_started = True
+        port = int(os.getenv("METRICS_PORT", 0))
+        if port:
+            start_prometheus_server(port)
+        interval = float(os.getenv("METRICS_LOG_INTERVAL_SECONDS", 0))
+        if interval > 0:
+            start_json_logger(interval)
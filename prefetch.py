@@ -0,0 +1,97 @@
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+class PrefetchPool:
+    """Shared thread pool that computes results ahead of time, keyed by an opaque id"""
+
+    def __init__(self, max_workers=4, max_pending=32, max_entries=1024):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.max_entries = max_entries
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch") if max_workers > 0 else None
+        self._futures = OrderedDict()
+        self._pending = 0
+        # Re-entrant: cancelling a queued future runs _on_done synchronously while the lock is held
+        self._lock = threading.RLock()
+        self._stats = {"submitted": 0, "rejected": 0, "taken": 0, "cancelled": 0, "discarded": 0}
+
+    def submit(self, key, fn, *args, **kwargs):
+        """Start computing fn(*args, **kwargs) in the background; returns False if the queue is full"""
+        with self._lock:
+            if self._executor is None or self._pending >= self.max_pending:
+                self._stats["rejected"] += 1
+                return False
+
+            self._discard(key)
+            future = self._executor.submit(fn, *args, **kwargs)
+            self._pending += 1
+            self._futures[key] = future
+            self._stats["submitted"] += 1
+
+            # Drop the oldest results nobody came back for
+            while len(self._futures) > self.max_entries:
+                _, stale = self._futures.popitem(last=False)
+                stale.cancel()
+                self._stats["discarded"] += 1
+
+        future.add_done_callback(self._on_done)
+        return True
+
+    def take(self, key):
+        """Remove and return the future for a key, or None if nothing was prefetched"""
+        with self._lock:
+            future = self._futures.pop(key, None)
+            if future is not None:
+                self._stats["taken"] += 1
+            return future
+
+    def cancel(self, key):
+        """Cancel or discard the prefetched result for a key"""
+        with self._lock:
+            if key in self._futures:
+                self._discard(key)
+                self._stats["cancelled"] += 1
+
+    def stats(self):
+        """Return prefetch counters and current queue depth"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["pending"] = self._pending
+            stats["stored"] = len(self._futures)
+        return stats
+
+    def shutdown(self, wait=False):
+        """Stop accepting work and cancel everything still queued"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _discard(self, key):
+        """Cancel the future stored under a key; caller holds the lock"""
+        future = self._futures.pop(key, None)
+        if future is not None:
+            future.cancel()
+
+    def _on_done(self, future):
+        """Release a queue slot once a job finishes or is cancelled"""
+        with self._lock:
+            self._pending -= 1
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def get_prefetch_pool():
+    """Return the process-wide prefetch pool, configured from the environment"""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = PrefetchPool(
+                max_workers=int(os.getenv("PREFETCH_WORKERS", 4)),
+                max_pending=int(os.getenv("PREFETCH_MAX_PENDING", 32))
+            )
+        return _default_pool
@@ -0,0 +1,267 @@
+import json
+import os
+import re
+import threading
+
+import metrics
+from config import load_config
+
+load_config()
+
+QUESTION_COUNT = 5
+# A question runs 20-40 tokens; the rest covers JSON quoting and the occasional long one
+TOKENS_PER_QUESTION = 60
+RESPONSE_OVERHEAD_TOKENS = 16
+MAX_PROMPT_TOKENS = int(os.getenv("QUESTION_PROMPT_MAX_TOKENS", 200))
+
+SYSTEM_PROMPT = "You are a technical interviewer. Reply with only a JSON array of strings."
+QUESTION_PROMPT = (
+    "Tech stack: {stack}.\n"
+    "Write {count} interview questions on: core language concepts, frameworks/libraries, "
+    "databases and data handling, problem solving/algorithms, a real-world scenario. "
+    'One sentence each. Format: ["...", "..."]'
+)
+
+NUMBERED_LINE = re.compile(r'^\d+\.\s+')
+JSON_STRING = re.compile(r'"((?:[^"\\]|\\.)*)"')
+
+_encoding = None
+_encoding_lock = threading.Lock()
+
+
+def _get_encoding():
+    """Load the tiktoken encoding on first use; False if tiktoken or its data is unavailable"""
+    global _encoding
+    with _encoding_lock:
+        if _encoding is None:
+            try:
+                import tiktoken
+                _encoding = tiktoken.get_encoding("cl100k_base")
+            except Exception as e:
+                print(f"Tokenizer Error: {e}; using approximate token counts")
+                _encoding = False
+        return _encoding
+
+
+def count_tokens(text):
+    """Token count of text, approximated as 4 characters per token without tiktoken"""
+    encoding = _get_encoding()
+    if encoding:
+        return len(encoding.encode(text))
+    return len(text) // 4 + 1
+
+
+def count_message_tokens(messages):
+    # Chat formatting adds a few tokens per message
+    return sum(count_tokens(message["content"]) + 4 for message in messages)
+
+
+def max_tokens_for(count):
+    """Completion budget for count questions"""
+    return count * TOKENS_PER_QUESTION + RESPONSE_OVERHEAD_TOKENS
+
+
+def build_question_messages(tech_stack, count=QUESTION_COUNT, max_prompt_tokens=MAX_PROMPT_TOKENS):
+    """Compact question prompt, dropping trailing technologies until it fits max_prompt_tokens"""
+    stack = list(tech_stack) or ["general software engineering"]
+    while True:
+        messages = [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": QUESTION_PROMPT.format(stack=", ".join(stack), count=count)}
+        ]
+        if len(stack) == 1 or count_message_tokens(messages) <= max_prompt_tokens:
+            return messages
+        stack.pop()
+
+
+def parse_question_list(text, count=QUESTION_COUNT):
+    """Parse a JSON array of questions in one pass, repairing truncated or chatty replies"""
+    text = _strip_code_fence(text.strip())
+    try:
+        items = json.loads(text)
+    except ValueError:
+        items = None
+    if isinstance(items, dict):
+        # {"questions": [...]} and similar wrappers
+        items = next((value for value in items.values() if isinstance(value, list)), None)
+    if isinstance(items, list):
+        return _clean_questions(items, count)
+
+    # Repair: prose around the array, or a reply cut off by max_tokens
+    start = text.find("[")
+    if start != -1:
+        end = text.rfind("]")
+        if end > start:
+            try:
+                items = json.loads(text[start:end + 1])
+            except ValueError:
+                items = None
+            if isinstance(items, list):
+                metrics.inc("question_parse_repairs_total", method="extract_array")
+                return _clean_questions(items, count)
+        items = [_decode_string(match) for match in JSON_STRING.findall(text[start:])]
+        if items:
+            metrics.inc("question_parse_repairs_total", method="complete_strings")
+            return _clean_questions(items, count)
+
+    # Last resort: the model ignored the format and sent a numbered list
+    items = [NUMBERED_LINE.sub("", line.strip()) for line in text.split("\n") if NUMBERED_LINE.match(line.strip())]
+    if items:
+        metrics.inc("question_parse_repairs_total", method="numbered_lines")
+    return _clean_questions(items, count)
+
+
+class QuestionStreamParser:
+    """Incrementally extracts questions from a streamed reply as soon as each one is complete"""
+
+    def __init__(self, count=QUESTION_COUNT):
+        self.count = count
+        self.questions = []
+        self.mode = None
+        self._buffer = ""
+        self._in_string = False
+        self._escaped = False
+        # A closed string waits for the next character: ":" makes it a key, anything else a value
+        self._pending = None
+        self._object = None
+        self._object_depth = 0
+        self._key = None
+
+    def feed(self, text):
+        """Consume the next chunk of text; returns the questions it completed"""
+        if self.mode is None:
+            # Skip any preamble: wait for the array or the first numbered line
+            self._buffer += text
+            text = self._detect_mode()
+            if self.mode is None:
+                return []
+        if self.mode == "lines":
+            return self._feed_lines(text)
+        return self._feed_json(text)
+
+    def close(self):
+        """Flush whatever is left once the stream ends"""
+        if self.mode is None:
+            # Neither an array nor a numbered list arrived; let the block parser repair what did
+            completed = self._accept(parse_question_list(self._buffer, self.count))
+        elif self.mode == "lines":
+            completed = self._accept([self._line_question(self._buffer)])
+        else:
+            completed = self._accept([self._pending] if self._pending is not None and self._object is None else [])
+            self._pending = None
+        self._buffer = ""
+        return completed
+
+    def done(self):
+        return len(self.questions) >= self.count
+
+    def _detect_mode(self):
+        """Pick json or lines mode from the buffered text; returns the text to parse in that mode"""
+        for line in self._buffer.splitlines(keepends=True):
+            if self._line_question(line) is not None:
+                self.mode = "lines"
+                text, self._buffer = self._buffer, ""
+                return text
+            if "[" in line:
+                self.mode = "json"
+                text = self._buffer[self._buffer.index("["):]
+                self._buffer = ""
+                return text
+        return ""
+
+    def _feed_json(self, text):
+        found = []
+        for char in text:
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    self._pending = _decode_string(self._buffer)
+                    continue
+                self._buffer += char
+                continue
+            if char.isspace():
+                continue
+            if self._pending is not None:
+                self._resolve_pending(char == ":", found)
+            if char == '"':
+                self._in_string = True
+                self._buffer = ""
+            elif char == "{":
+                if self._object_depth == 0:
+                    self._object = {}
+                self._object_depth += 1
+            elif char == "}" and self._object_depth:
+                self._object_depth -= 1
+                if self._object_depth == 0:
+                    # Objects such as {"question": "..."}; _clean_questions takes the question out
+                    found.append(self._object)
+                    self._object = None
+        return self._accept(found)
+
+    def _resolve_pending(self, is_key, found):
+        value, self._pending = self._pending, None
+        if self._object_depth > 1:
+            return
+        if self._object is not None:
+            if is_key:
+                self._key = value
+            elif self._key is not None:
+                self._object[self._key] = value
+                self._key = None
+        elif not is_key:
+            found.append(value)
+
+    def _feed_lines(self, text):
+        self._buffer += text
+        *lines, self._buffer = self._buffer.split("\n")
+        return self._accept([self._line_question(line) for line in lines])
+
+    def _line_question(self, line):
+        line = line.strip()
+        return NUMBERED_LINE.sub("", line) if NUMBERED_LINE.match(line) else None
+
+    def _accept(self, candidates):
+        accepted = []
+        for question in _clean_questions(candidates, self.count - len(self.questions), self.questions):
+            self.questions.append(question)
+            accepted.append(question)
+        return accepted
+
+
+def _strip_code_fence(text):
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1] if "\n" in text else ""
+        if text.rstrip().endswith("```"):
+            text = text.rstrip()[:-3]
+    return text.strip()
+
+
+def _decode_string(raw):
+    try:
+        return json.loads(f'"{raw}"')
+    except ValueError:
+        return raw
+
+
+def _clean_questions(items, count, seen=()):
+    """Keep up to count distinct, non-empty question strings"""
+    questions = []
+    known = {question.lower() for question in seen}
+    for item in items:
+        if len(questions) >= count:
+            break
+        if isinstance(item, dict):
+            # [{"question": "..."}] and other one-key objects
+            item = item.get("question", next(iter(item.values())) if len(item) == 1 else None)
+        if not isinstance(item, str):
+            continue
+        question = item.strip()
+        if not question or question.lower() in known:
+            continue
+        known.add(question.lower())
+        questions.append(question)
+    return questions
@@ -0,0 +1,176 @@
+import argparse
+import json
+import os
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from question_cache import stack_key
+
+
+class QuestionBank:
+    """Precomputed questions per tech stack with set-similarity lookup"""
+
+    def __init__(self, stacks=None, questions=None):
+        self.stacks = [frozenset(stack) for stack in (stacks or [])]
+        self.questions = [list(batch) for batch in (questions or [])]
+        self._index = {}
+        for stack_id, stack in enumerate(self.stacks):
+            for tech in stack:
+                self._index.setdefault(tech, []).append(stack_id)
+
+    def __len__(self):
+        return len(self.stacks)
+
+    @classmethod
+    def load(cls, path):
+        """Load a bank file written by save(); a missing file yields an empty bank"""
+        if not path or not os.path.exists(path):
+            return cls()
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["stacks"], data["questions"])
+
+    def save(self, path):
+        """Write the bank and its inverted index as compact JSON"""
+        data = {
+            "version": 1,
+            "stacks": [sorted(stack) for stack in self.stacks],
+            "questions": self.questions,
+            "index": self._index
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"), ensure_ascii=False)
+
+    def add(self, tech_stack, questions):
+        """Add or replace the questions for a tech stack"""
+        stack = frozenset(stack_key(tech_stack).split("|")) - {""}
+        if stack in self.stacks:
+            self.questions[self.stacks.index(stack)] = list(questions)
+            return
+        stack_id = len(self.stacks)
+        self.stacks.append(stack)
+        self.questions.append(list(questions))
+        for tech in stack:
+            self._index.setdefault(tech, []).append(stack_id)
+
+    def lookup(self, tech_stack, threshold=0.6):
+        """Return (questions, similarity) for the closest stack at or above threshold, or (None, 0.0)"""
+        query = frozenset(stack_key(tech_stack).split("|")) - {""}
+        if not query:
+            return None, 0.0
+
+        # Count shared technologies per candidate stack via the inverted index
+        overlaps = Counter()
+        for tech in query:
+            overlaps.update(self._index.get(tech, ()))
+
+        best_id, best_score = None, 0.0
+        for stack_id, shared in overlaps.items():
+            score = shared / (len(query) + len(self.stacks[stack_id]) - shared)
+            if score > best_score:
+                best_id, best_score = stack_id, score
+
+        if best_id is None or best_score < threshold:
+            return None, best_score
+        return list(self.questions[best_id]), best_score
+
+
+# Stacks candidates most often report, most common first
+POPULAR_STACKS = [
+    ["python", "django", "postgresql"], ["javascript", "react", "express", "mongodb"],
+    ["java", "spring", "mysql"], ["typescript", "react", "express", "postgresql"],
+    ["python", "flask", "postgresql"], ["python", "fastapi", "postgresql"], ["c#", ".net", "azure"],
+    ["php", "laravel", "mysql"], ["python", "pandas", "numpy", "scikit-learn"], ["typescript", "angular"],
+    ["javascript", "react"], ["typescript", "react"], ["javascript", "vue"], ["java", "spring", "postgresql"],
+    ["python", "pytorch"], ["python", "tensorflow"], ["go", "postgresql", "docker"], ["docker", "kubernetes", "aws"],
+    ["python", "django", "redis", "docker"], ["javascript", "html", "css"], ["html", "css", "bootstrap"],
+    ["typescript", "react", "tailwind"], ["python", "aws"], ["java", "aws"], ["go", "docker", "kubernetes"],
+    ["docker", "kubernetes", "jenkins"], ["kotlin", "spring"], ["python", "opencv"], ["python", "flask", "mongodb"],
+    ["javascript", "express", "mysql"], ["python", "django", "mysql"], ["c#", ".net"], ["ruby", "postgresql"],
+    ["rust", "docker"], ["c++", "opencv"], ["python", "gcp"], ["java", "kubernetes"], ["javascript", "react", "aws"]
+]
+
+# Languages each framework is used from, so generated pairs are stacks people actually have
+FRAMEWORK_LANGUAGES = {
+    "django": ["python"], "flask": ["python"], "fastapi": ["python"],
+    "express": ["javascript", "typescript"], "spring": ["java", "kotlin"], "laravel": ["php"], ".net": ["c#"],
+    "react": ["javascript", "typescript"], "vue": ["javascript", "typescript"], "angular": ["typescript"]
+}
+
+
+def common_stacks(tech_categories, limit=200):
+    """Common stacks, most common first: curated popular stacks, single technologies, then
+    language + framework pairs and language + framework + database combinations from the same ecosystem"""
+    vocabulary = {tech for techs in tech_categories.values() for tech in techs}
+    databases = tech_categories.get("Databases", [])
+    pairs = [[language, framework] for framework, languages in FRAMEWORK_LANGUAGES.items()
+             for language in languages if framework in vocabulary and language in vocabulary]
+
+    candidates = [stack for stack in POPULAR_STACKS if vocabulary.issuperset(stack)]
+    candidates += [[tech] for techs in tech_categories.values() for tech in techs]
+    candidates += pairs
+    candidates += [pair + [database] for pair in pairs for database in databases]
+
+    stacks, seen = [], set()
+    for stack in candidates:
+        if frozenset(stack) not in seen:
+            seen.add(frozenset(stack))
+            stacks.append(stack)
+    return stacks[:limit]
+
+
+_default_bank = None
+_default_bank_lock = threading.Lock()
+
+
+def get_question_bank():
+    """Return the process-wide question bank, loaded from QUESTION_BANK_PATH"""
+    global _default_bank
+    with _default_bank_lock:
+        if _default_bank is None:
+            _default_bank = QuestionBank.load(os.getenv("QUESTION_BANK_PATH", "question_bank.json"))
+        return _default_bank
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-generate technical questions for common tech stacks")
+    parser.add_argument("--output", default=os.getenv("QUESTION_BANK_PATH", "question_bank.json"),
+                        help="bank file to write")
+    parser.add_argument("--limit", type=int, default=200, help="maximum number of stacks to generate")
+    parser.add_argument("--workers", type=int, default=4, help="concurrent API requests")
+    parser.add_argument("--resume", action="store_true", help="keep stacks already in the output file")
+    args = parser.parse_args()
+
+    from question_generator import TechnicalQuestionGenerator
+    from tech_extractor import TECH_CATEGORIES
+
+    bank = QuestionBank.load(args.output) if args.resume else QuestionBank()
+    generator = TechnicalQuestionGenerator(bank=QuestionBank())
+    stacks = [stack for stack in common_stacks(TECH_CATEGORIES, args.limit)
+              if bank.lookup(stack, threshold=1.0)[0] is None]
+
+    failed = 0
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        futures = {
+            executor.submit(generator.generate_questions, stack, use_cache=False, fallback=False): stack
+            for stack in stacks
+        }
+        for i, future in enumerate(as_completed(futures), 1):
+            stack = futures[future]
+            try:
+                questions = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"[{i}/{len(stacks)}] {', '.join(stack)}: failed ({e})")
+                continue
+            if questions:
+                bank.add(stack, questions)
+            print(f"[{i}/{len(stacks)}] {', '.join(stack)}: {len(questions)} questions")
+
+    bank.save(args.output)
+    print(f"Wrote {len(bank)} stacks to {args.output} ({failed} failed)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+def stack_key(tech_stack):
+    """Build an order-insensitive, case-normalized cache key for a tech stack"""
+    items = {item.strip().lower() for item in tech_stack if item and item.strip()}
+    return "|".join(sorted(items))
+
+
+class QuestionCache:
+    """Two-tier question cache: in-process LRU in front of a SQLite store"""
+
+    def __init__(self, path="question_cache.db", ttl_seconds=7 * 24 * 3600,
+                 max_entries=5000, memory_entries=256):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "memory_hits": 0, "disk_hits": 0, "evictions": 0}
+
+        self._conn = None
+        if path:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS questions (
+                    stack_key TEXT PRIMARY KEY,
+                    questions TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_questions_last_access ON questions(last_access)")
+            self._conn.commit()
+
+    def get(self, key):
+        """Return cached questions for a stack key, or None on a miss"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                questions, created_at = entry
+                if now - created_at <= self.ttl_seconds:
+                    self._memory.move_to_end(key)
+                    self._stats["hits"] += 1
+                    self._stats["memory_hits"] += 1
+                    return list(questions)
+                del self._memory[key]
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT questions, created_at FROM questions WHERE stack_key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    if now - row[1] <= self.ttl_seconds:
+                        self._conn.execute(
+                            "UPDATE questions SET last_access = ? WHERE stack_key = ?", (now, key)
+                        )
+                        self._conn.commit()
+                        questions = json.loads(row[0])
+                        self._remember(key, questions, row[1])
+                        self._stats["hits"] += 1
+                        self._stats["disk_hits"] += 1
+                        return list(questions)
+                    self._conn.execute("DELETE FROM questions WHERE stack_key = ?", (key,))
+                    self._conn.commit()
+
+            self._stats["misses"] += 1
+            return None
+
+    def put(self, key, questions):
+        """Store questions for a stack key in both tiers"""
+        now = time.time()
+        with self._lock:
+            self._remember(key, list(questions), now)
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO questions (stack_key, questions, created_at, last_access) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(list(questions)), now, now)
+                )
+                self._evict_disk(now)
+                self._conn.commit()
+
+    def stats(self):
+        """Return hit/miss counters and current tier sizes"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_size"] = len(self._memory)
+            if self._conn is not None:
+                stats["disk_size"] = self._conn.execute("SELECT COUNT(*) FROM questions").fetchone()[0]
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    def clear(self):
+        """Drop every cached entry"""
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM questions")
+                self._conn.commit()
+
+    def _remember(self, key, questions, created_at):
+        """Insert into the memory tier, evicting least recently used entries"""
+        self._memory[key] = (questions, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _evict_disk(self, now):
+        """Remove expired rows, then the least recently used rows above the size limit"""
+        cursor = self._conn.execute(
+            "DELETE FROM questions WHERE created_at < ?", (now - self.ttl_seconds,)
+        )
+        self._stats["evictions"] += cursor.rowcount
+        count = self._conn.execute("SELECT COUNT(*) FROM questions").fetchone()[0]
+        if count > self.max_entries:
+            cursor = self._conn.execute(
+                """
+                DELETE FROM questions WHERE stack_key IN (
+                    SELECT stack_key FROM questions ORDER BY last_access ASC LIMIT ?
+                )
+                """,
+                (count - self.max_entries,)
+            )
+            self._stats["evictions"] += cursor.rowcount
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_question_cache():
+    """Return the process-wide question cache, configured from the environment"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = QuestionCache(
+                path=os.getenv("QUESTION_CACHE_PATH", "question_cache.db"),
+                ttl_seconds=float(os.getenv("QUESTION_CACHE_TTL_SECONDS", 7 * 24 * 3600)),
+                max_entries=int(os.getenv("QUESTION_CACHE_MAX_ENTRIES", 5000)),
+                memory_entries=int(os.getenv("QUESTION_CACHE_MEMORY_ENTRIES", 256))
+            )
+        return _default_cache
@@ -1,62 +1,344 @@
-from perplexity import Perplexity
 import os
-from dotenv import load_dotenv
+import random
+import socket
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import metrics
+from config import load_config
+from llm_client import get_llm_client
+from prompts import (QUESTION_COUNT, SYSTEM_PROMPT, QuestionStreamParser, build_question_messages,
+                     count_tokens, max_tokens_for, parse_question_list)
+from question_bank import get_question_bank
+from question_cache import get_question_cache, stack_key
+from resilience import CircuitOpenError, RateLimitTimeout, estimate_tokens, get_llm_guard
+from singleflight import get_single_flight
+
+load_config()
 
-load_dotenv()
 
 class TechnicalQuestionGenerator:
-    def __init__(self):
-        self.client = Perplexity()
+    def __init__(self, client=None, cache=None, bank=None, guard=None, index=None):
+        # The client and index are built on first use, keeping openai and numpy out of startup
+        self._client = client
+        self._index = index
+        self.cache = cache if cache is not None else get_question_cache()
+        self.bank = bank if bank is not None else get_question_bank()
+        self.guard = guard if guard is not None else get_llm_guard()
+        self.bank_threshold = float(os.getenv("QUESTION_BANK_THRESHOLD", 0.6))
+        self.single_flight = get_single_flight()
+        self.shuffle_coalesced = os.getenv("QUESTION_COALESCE_SHUFFLE", "false").lower() in ("1", "true", "yes")
+        
+        # Latency SLO: fast tier first, hedge with the main model, fall back at the deadline
+        self.model = os.getenv("LLM_MODEL", "llama-3.1-sonar-large-128k-online")
+        self.fast_model = os.getenv("LLM_FAST_MODEL", "llama-3.1-sonar-small-128k-online")
+        self.slo_enabled = os.getenv("QUESTION_SLO_ENABLED", "false").lower() in ("1", "true", "yes")
+        self.hedge_after = float(os.getenv("QUESTION_HEDGE_AFTER_SECONDS", 2.5))
+        self.slo_deadline = float(os.getenv("QUESTION_DEADLINE_SECONDS", 8))
+        self.hedge_pool = ThreadPoolExecutor(max_workers=int(os.getenv("QUESTION_HEDGE_WORKERS", 32)),
+                                             thread_name_prefix="hedge")
+        metrics.registry.register_collector("question_cache", self.cache.stats)
+        metrics.registry.register_collector("single_flight", self.single_flight.stats)
+        metrics.registry.register_collector("llm_guard", self.guard.stats)
+        metrics.registry.register_collector(
+            "question_index", lambda: {"questions": len(self._index) if self._index is not None else 0}
+        )
+    
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = get_llm_client()
+        return self._client
+    
+    @client.setter
+    def client(self, client):
+        self._client = client
+    
+    @property
+    def index(self):
+        if self._index is None:
+            from question_index import get_question_index
+            self._index = get_question_index()
+        return self._index
     
-    def generate_questions(self, tech_stack):
+    @index.setter
+    def index(self, index):
+        self._index = index
+    
+    def warm_up(self):
+        """Build the client and index and load the tokenizer now instead of on the first request"""
+        self.client
+        self.index
+        count_tokens(SYSTEM_PROMPT)
+    
+    def generate_questions(self, tech_stack, use_cache=True, fallback=True):
         """Generate 3-5 technical questions based on candidate's tech stack"""
+        key = stack_key(tech_stack)
+        if not use_cache:
+            return self._request_questions(key, tech_stack, fallback)
+        
+        cached = self.cache.get(key)
+        if cached:
+            return cached
+        
+        # Answer from the precomputed bank when a close enough stack exists
+        banked, _ = self.bank.lookup(tech_stack, self.bank_threshold)
+        if banked:
+            return banked
+        
+        # Concurrent candidates with the same stack share one upstream request
+        questions, shared = self.single_flight.do(key, self._request_questions, key, tech_stack, fallback)
+        return self._coalesced_copy(questions, shared)
+    
+    def stream_questions(self, tech_stack, use_cache=True):
+        """Yield questions one at a time as soon as each one is complete"""
+        key = stack_key(tech_stack)
+        if not use_cache:
+            yield from self._stream_request(key, tech_stack, [])
+            return
         
-        prompt = f"""
-        You are an expert technical interviewer. Based on the candidate's tech stack: {', '.join(tech_stack)}, 
-        generate exactly 5 technical interview questions that assess:
+        cached = self.cache.get(key)
+        if cached:
+            yield from cached
+            return
         
-        1. Core programming concepts in their primary language
-        2. Framework/library specific knowledge
-        3. Database and data handling skills
-        4. Problem-solving and algorithms
-        5. Real-world application scenarios
+        banked, _ = self.bank.lookup(tech_stack, self.bank_threshold)
+        if banked:
+            yield from banked
+            return
         
-        Format your response as a numbered list with clear, specific questions.
-        Each question should be appropriate for assessing proficiency in the mentioned technologies.
-        """
+        call, leader = self.single_flight.begin(key)
+        if not leader:
+            yield from self._coalesced_copy(self.single_flight.wait(call), True)
+            return
         
+        questions = []
         try:
-            response = self.client.chat.completions.create(
-                model="sonar-reasoning",
-                messages=[
-                    {"role": "system", "content": "You are a technical interviewer creating relevant assessment questions."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=800
-            )
-            
-            questions = response.choices[0].message.content.strip()
-            return self._parse_questions(questions)
-            
+            yield from self._stream_request(key, tech_stack, questions)
+        finally:
+            self.single_flight.finish(key, call, questions or self._fallback_questions(tech_stack))
+    
+    def _request_questions(self, key, tech_stack, fallback=True):
+        """Request a batch of questions from the API, falling back on errors unless fallback is False"""
+        if self.slo_enabled:
+            return self._request_within_slo(key, tech_stack, fallback)
+        try:
+            return self._call_model(self.model, self._build_messages(tech_stack), key)
         except Exception as e:
+            if not fallback:
+                raise
+            print(f"API Error: {e}")
+            metrics.inc("question_fallbacks_total", reason=self._fallback_reason(e))
             return self._fallback_questions(tech_stack)
     
-    def _parse_questions(self, questions_text):
-        """Parse numbered questions from response"""
-        lines = questions_text.split('\n')
-        questions = []
+    def _request_within_slo(self, key, tech_stack, fallback=True):
+        """Ask the fast tier, hedge with the main model if it is slow, and settle for fallbacks at the deadline"""
+        started = time.monotonic()
+        deadline = started + self.slo_deadline
+        messages = self._build_messages(tech_stack)
+        tiers = [("fast", self.fast_model), ("hedge", self.model)]
+        pending = {}
+        errors = []
         
-        for line in lines:
-            line = line.strip()
-            if re.match(r'^\d+\.\s+', line):
-                question = re.sub(r'^\d+\.\s+', '', line)
+        def launch(tier, model):
+            pending[self.hedge_pool.submit(self._call_model, model, messages, key, deadline)] = tier
+        
+        launch(*tiers.pop(0))
+        while pending:
+            wait_until = min(deadline, started + self.hedge_after) if tiers else deadline
+            done, _ = wait(pending, timeout=max(wait_until - time.monotonic(), 0), return_when=FIRST_COMPLETED)
+            for future in done:
+                tier = pending.pop(future)
+                try:
+                    questions = future.result()
+                except Exception as e:
+                    errors.append(e)
+                    continue
+                metrics.inc("question_slo_wins_total", tier=tier)
+                metrics.observe("question_slo_latency_seconds", time.monotonic() - started, tier=tier)
+                return questions
+            
+            if time.monotonic() >= deadline:
+                break
+            # Hedge once the fast tier is overdue, or right away if it already failed
+            if tiers and (not pending or time.monotonic() >= started + self.hedge_after):
+                metrics.inc("llm_hedges_total")
+                launch(*tiers.pop(0))
+        
+        # Requests still in flight keep running and cache their questions for the next candidate
+        error = errors[-1] if errors and not pending else TimeoutError(
+            f"No questions within the {self.slo_deadline:g}s deadline")
+        if not fallback:
+            raise error
+        print(f"API Error: {error}")
+        metrics.inc("question_slo_wins_total", tier="fallback")
+        metrics.observe("question_slo_latency_seconds", time.monotonic() - started, tier="fallback")
+        metrics.inc("question_fallbacks_total", reason=self._fallback_reason(error))
+        return self.cache.get(key) or self._fallback_questions(tech_stack)
+    
+    def _call_model(self, model, messages, key, deadline=None):
+        """One guarded request to model; caches and returns the parsed questions"""
+        max_tokens = max_tokens_for(QUESTION_COUNT)
+        started = time.perf_counter()
+        try:
+            # Rate limited and retried within a deadline; skipped entirely while the circuit is open
+            response = self.guard.call(
+                lambda timeout: self.client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    temperature=0.7,
+                    max_tokens=max_tokens,
+                    timeout=timeout
+                ),
+                tokens=estimate_tokens(messages, max_tokens),
+                deadline=deadline
+            )
+        except Exception:
+            self._record_request(model, "error", started)
+            raise
+        self._record_request(model, "ok", started, getattr(response, "usage", None))
+        
+        questions = self._parse_questions(response.choices[0].message.content.strip())
+        if not questions:
+            raise ValueError(f"No questions could be parsed from the {model} reply")
+        self.cache.put(key, questions)
+        self.index.add(questions, key.split("|"))
+        return questions
+    
+    def _stream_request(self, key, tech_stack, questions):
+        """Stream a batch of questions from the API, appending each one to questions as it is yielded"""
+        # Streaming already shows the first question early; the SLO picks the fast tier and bounds the wait
+        model = self.fast_model if self.slo_enabled else self.model
+        deadline = time.monotonic() + self.slo_deadline if self.slo_enabled else None
+        started = time.perf_counter()
+        usage = None
+        messages = self._build_messages(tech_stack)
+        max_tokens = max_tokens_for(QUESTION_COUNT)
+        stream = None
+        expired = threading.Event()
+        timer = None
+        try:
+            # Only opening the stream is retried; a stream that breaks midway counts against the breaker
+            stream = self.guard.call(
+                lambda timeout: self.client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    temperature=0.7,
+                    max_tokens=max_tokens,
+                    stream=True,
+                    timeout=timeout
+                ),
+                tokens=estimate_tokens(messages, max_tokens),
+                deadline=deadline
+            )
+            if deadline is not None:
+                # A stalled read never reaches the loop below; closing the stream at the deadline unblocks it
+                timer = threading.Timer(max(deadline - time.monotonic(), 0), self._expire_stream, (stream, expired))
+                timer.daemon = True
+                timer.start()
+            
+            # Each question is yielded as soon as its JSON string closes
+            parser = QuestionStreamParser(QUESTION_COUNT)
+            for chunk in stream:
+                if expired.is_set():
+                    break
+                usage = getattr(chunk, "usage", None) or usage
+                if not chunk.choices:
+                    continue
+                for question in parser.feed(chunk.choices[0].delta.content or ""):
+                    questions.append(question)
+                    yield question
+                if parser.done():
+                    # Release the connection instead of leaving the rest of the reply unread
+                    getattr(stream, "close", lambda: None)()
+                    break
+            if expired.is_set():
+                raise TimeoutError(f"Stream missed the {self.slo_deadline:g}s deadline")
+            
+            for question in parser.close():
                 questions.append(question)
+                yield question
+            
+        except Exception as e:
+            if expired.is_set():
+                # Reads fail once the timer closed the stream; report the deadline, not the closed connection
+                e = TimeoutError(f"Stream missed the {self.slo_deadline:g}s deadline")
+            self._record_request(model, "error", started)
+            print(f"API Error: {e}")
+            if stream is not None:
+                self.guard.breaker.record_failure()
+            if not questions:
+                metrics.inc("question_fallbacks_total", reason=self._fallback_reason(e))
+                # A request that outlived an earlier deadline may have cached questions since
+                for question in self.cache.get(key) or self._fallback_questions(tech_stack):
+                    questions.append(question)
+                    yield question
+            return
+        finally:
+            if timer is not None:
+                timer.cancel()
         
-        return questions[:5]  # Ensure max 5 questions
+        self._record_request(model, "ok", started, usage)
+        if questions:
+            self.cache.put(key, questions)
+            self.index.add(questions, key.split("|"))
+    
+    def _expire_stream(self, stream, expired):
+        """Deadline timer: flag the stream as expired and unblock a read waiting on it"""
+        expired.set()
+        try:
+            # Closing the response does not interrupt a blocked recv; shutting the socket down does
+            response = getattr(stream, "response", None)
+            network_stream = response.extensions.get("network_stream") if response is not None else None
+            sock = network_stream.get_extra_info("socket") if network_stream is not None else None
+            if sock is not None:
+                sock.shutdown(socket.SHUT_RDWR)
+            getattr(stream, "close", lambda: None)()
+        except Exception:
+            # Generator streams (cassettes) cannot be closed from another thread; their read timeout applies
+            pass
+    
+    def _record_request(self, model, outcome, started, usage=None):
+        """Record latency, outcome and token usage of one LLM request"""
+        metrics.observe("llm_request_duration_seconds", time.perf_counter() - started, model=model, outcome=outcome)
+        metrics.inc("llm_requests_total", model=model, outcome=outcome)
+        if usage is not None:
+            metrics.observe("llm_prompt_tokens", getattr(usage, "prompt_tokens", 0) or 0, model=model)
+            metrics.observe("llm_completion_tokens", getattr(usage, "completion_tokens", 0) or 0, model=model)
+    
+    def _fallback_reason(self, error):
+        if isinstance(error, CircuitOpenError):
+            return "circuit_open"
+        if isinstance(error, RateLimitTimeout):
+            return "rate_limited"
+        if isinstance(error, TimeoutError):
+            return "deadline"
+        return "api_error"
+    
+    def _coalesced_copy(self, questions, shared):
+        """Give each caller its own list, shuffled for callers that joined another request"""
+        questions = list(questions)
+        if shared and self.shuffle_coalesced:
+            random.shuffle(questions)
+        return questions
+    
+    def _build_messages(self, tech_stack):
+        """Build the chat messages for a question generation request"""
+        return build_question_messages(tech_stack, QUESTION_COUNT)
+    
+    def _parse_questions(self, questions_text):
+        """Parse the JSON question list from a response"""
+        with metrics.timer("question_parse_duration_seconds"):
+            return parse_question_list(questions_text, QUESTION_COUNT)
     
     def _fallback_questions(self, tech_stack):
         """Fallback questions when API fails"""
+        # Prefer banked questions for the most similar stack over generic ones
+        banked, _ = self.bank.lookup(tech_stack, threshold=0.0)
+        if banked:
+            return banked
+        
         base_questions = [
             f"Explain the key features and use cases of {tech_stack[0] if tech_stack else 'your primary technology'}.",
             "Describe a challenging project you've worked on and how you overcame technical obstacles.",
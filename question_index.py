@@ -0,0 +1,300 @@
+import json
+import os
+import re
+import threading
+import zlib
+from array import array
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:
+    # No cross-process locking (Windows); run a single writer process there
+    fcntl = None
+
+from question_cache import stack_key
+
+WORD_PATTERN = re.compile(r"[a-z0-9+#]+")
+# Rows scored per matrix product, bounding temporary memory on large indexes
+SCORE_CHUNK_ROWS = 16384
+
+
+def question_features(text):
+    """Words, word bigrams and character trigrams of a normalized question"""
+    words = WORD_PATTERN.findall(text.lower())
+    features = words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+    padded = f" {' '.join(words)} "
+    features += [padded[i:i + 3] for i in range(len(padded) - 2)]
+    return features
+
+
+def vectorize(texts, dim):
+    """L2-normalized signed feature-hashing vectors, one row per text"""
+    matrix = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        # crc32 rather than hash() so vectors stay valid across processes
+        hashes = np.array([zlib.crc32(feature.encode("utf-8")) for feature in question_features(text)],
+                          dtype=np.uint32)
+        if len(hashes):
+            signs = np.where(hashes & 0x80000000, -1.0, 1.0).astype(np.float32)
+            np.add.at(matrix[row], hashes % dim, signs)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-9)
+
+
+class QuestionIndex:
+    """Similarity index over generated questions, persisted as a memory-mapped matrix plus a JSONL log"""
+
+    def __init__(self, path=None, dim=256, duplicate_threshold=0.8):
+        self.path = path
+        self.dim = dim
+        self.duplicate_threshold = duplicate_threshold
+        self.questions = []
+        self._known = set()
+        self._by_tech = {}
+        self._matrix = np.zeros((0, dim), dtype=np.float32)
+        self._log = None
+        self._lock = threading.Lock()
+        if path:
+            self._open()
+
+    def __len__(self):
+        return len(self.questions)
+
+    def add(self, questions, tech_stack):
+        """Index new questions for a stack, skipping near-duplicates of ones already indexed; returns how many were added"""
+        techs = self._techs(tech_stack)
+        with self._lock:
+            # Other processes may share the directory; append under their lock, after their rows
+            self._lock_file()
+            try:
+                self._catch_up()
+                questions = [question for question in questions if question.strip().lower() not in self._known]
+                if not questions:
+                    return 0
+                vectors = vectorize(questions, self.dim)
+                # Near-duplicates can only come from stacks that share a technology
+                keep = self._novel(vectors, self._max_similarity(vectors, self._rows_for(techs)))
+                if not keep:
+                    return 0
+                self._append([questions[i] for i in keep], vectors[keep], "|".join(sorted(techs)))
+                return len(keep)
+            finally:
+                self._unlock_file()
+
+    def lookup(self, tech_stack, seen=(), k=5):
+        """Up to k indexed questions for the stack, most relevant first, none close to seen or to each other"""
+        techs = self._techs(tech_stack)
+        with self._lock:
+            if self._log is not None and os.path.getsize(self._log_path) != self._log_offset:
+                self._lock_file()
+                try:
+                    self._catch_up()
+                finally:
+                    self._unlock_file()
+            rows = self._rows_for(techs)
+            if not len(rows) or k <= 0:
+                return []
+            # Questions mentioning the stack's technologies rank first
+            query = vectorize([" ".join(sorted(techs))], self.dim)
+            scores = self._max_similarity(query, rows, axis=0)
+            shortlist = min(len(rows), k * 8)
+            order = np.argpartition(-scores, shortlist - 1)[:shortlist]
+            shortlisted = rows[order[np.argsort(-scores[order])]]
+            candidates = np.asarray(self._matrix[shortlisted])
+            seen_vectors = self._vectors(seen)
+            max_seen = (candidates @ seen_vectors.T).max(axis=1) if len(seen_vectors) else None
+            picked = self._novel(candidates, max_seen, limit=k)
+            return [self.questions[shortlisted[i]] for i in picked]
+
+    def filter_unseen(self, questions, seen=()):
+        """Drop questions that repeat one in seen, or an earlier one in the list"""
+        if not questions:
+            return []
+        vectors = vectorize(questions, self.dim)
+        seen_vectors = self._vectors(seen)
+        max_seen = (vectors @ seen_vectors.T).max(axis=1) if len(seen_vectors) else None
+        return [questions[i] for i in self._novel(vectors, max_seen)]
+
+    def flush(self):
+        with self._lock:
+            if self._log is not None:
+                self._log.flush()
+                self._matrix_file.flush()
+
+    def close(self):
+        self.flush()
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    def _novel(self, vectors, max_existing=None, limit=None):
+        """Indexes of vectors below the duplicate threshold, given their best match elsewhere, and against each other"""
+        keep = []
+        for i in range(len(vectors)):
+            if max_existing is not None and max_existing[i] >= self.duplicate_threshold:
+                continue
+            if keep and (vectors[keep] @ vectors[i]).max() >= self.duplicate_threshold:
+                continue
+            keep.append(i)
+            if limit is not None and len(keep) >= limit:
+                break
+        return keep
+
+    def _max_similarity(self, vectors, rows, axis=1):
+        """Best cosine similarity of each vector against the given rows (axis=1), or of each row against the vectors (axis=0)"""
+        if axis == 1:
+            best = np.full(len(vectors), -1.0, dtype=np.float32)
+        else:
+            best = np.empty(len(rows), dtype=np.float32)
+        for start in range(0, len(rows), SCORE_CHUNK_ROWS):
+            chunk = rows[start:start + SCORE_CHUNK_ROWS]
+            similarities = self._matrix[chunk] @ vectors.T
+            if axis == 1:
+                best = np.maximum(best, similarities.max(axis=0))
+            else:
+                best[start:start + len(chunk)] = similarities.max(axis=1)
+        return best
+
+    def _vectors(self, texts):
+        texts = list(texts)
+        return vectorize(texts, self.dim) if texts else np.zeros((0, self.dim), dtype=np.float32)
+
+    def _techs(self, tech_stack):
+        return set(stack_key(tech_stack).split("|")) - {""}
+
+    def _rows_for(self, techs):
+        postings = [np.frombuffer(self._by_tech[tech], dtype=np.uint32) for tech in techs if tech in self._by_tech]
+        if not postings:
+            return np.zeros(0, dtype=np.int64)
+        return np.unique(np.concatenate(postings)).astype(np.int64)
+
+    def _append(self, questions, vectors, key):
+        start = len(self.questions)
+        end = start + len(questions)
+        self._reserve(end)
+        self._matrix[start:end] = vectors
+        for question in questions:
+            self._index_row(question, key)
+        if self._log is not None:
+            # Vectors land before their log lines, so a crash never leaves a logged row without a vector
+            self._matrix_file.flush()
+            for question in questions:
+                self._log.write(json.dumps({"q": question, "s": key}, ensure_ascii=False) + "\n")
+            self._log.flush()
+            self._log_offset = os.fstat(self._log.fileno()).st_size
+
+    def _index_row(self, question, key):
+        row = len(self.questions)
+        self.questions.append(question)
+        self._known.add(question.strip().lower())
+        for tech in key.split("|"):
+            self._by_tech.setdefault(tech, array("I")).append(row)
+
+    def _reserve(self, rows):
+        """Grow the matrix (doubling) to hold at least rows rows"""
+        capacity = self._capacity()
+        if rows <= capacity:
+            if self._log is None:
+                self._matrix = self._storage[:rows]
+            else:
+                self._matrix = self._matrix_file[:rows]
+            return
+        capacity = max(rows, capacity * 2, 1024)
+        if self._log is None:
+            storage = np.zeros((capacity, self.dim), dtype=np.float32)
+            storage[:len(self.questions)] = self._matrix
+            self._storage = storage
+            self._matrix = storage[:rows]
+        else:
+            self._matrix_file.flush()
+            del self._matrix_file
+            self._map(capacity)
+            self._matrix = self._matrix_file[:rows]
+
+    def _capacity(self):
+        if self._log is None:
+            return len(getattr(self, "_storage", ()))
+        return self._matrix_file.shape[0]
+
+    def _open(self):
+        os.makedirs(self.path, exist_ok=True)
+        meta_path = os.path.join(self.path, "meta.json")
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding="utf-8") as f:
+                self.dim = json.load(f)["dim"]
+        else:
+            with open(meta_path, "w", encoding="utf-8") as f:
+                json.dump({"version": 1, "dim": self.dim}, f)
+
+        # The log is the source of truth for how many rows are valid
+        self._log_path = os.path.join(self.path, "questions.jsonl")
+        self._log_offset = 0
+        self._log = open(self._log_path, "a", encoding="utf-8")
+        matrix_path = os.path.join(self.path, "vectors.f32")
+        existing = os.path.getsize(matrix_path) // (self.dim * 4) if os.path.exists(matrix_path) else 0
+        self._lock_file()
+        try:
+            self._map(max(existing, 1024))
+            self._catch_up()
+        finally:
+            self._unlock_file()
+
+    def _catch_up(self):
+        """Load log lines appended since the last read, by this or another process; call with the file lock held"""
+        if self._log is None:
+            return
+        with open(self._log_path, "rb") as f:
+            f.seek(self._log_offset)
+            data = f.read()
+        offset = self._log_offset
+        for line in data.splitlines(keepends=True):
+            try:
+                if not line.endswith(b"\n"):
+                    raise ValueError("unterminated line")
+                entry = json.loads(line)
+                question, key = entry["q"], entry["s"]
+            except (ValueError, KeyError, TypeError):
+                break
+            self._index_row(question, key)
+            offset += len(line)
+        if offset < self._log_offset + len(data):
+            # No writer is mid-line while we hold the lock, so this is a line torn by a crash;
+            # cut it off so new rows are not appended after it and lost on the next load
+            print(f"Question Index Error: dropping {self._log_offset + len(data) - offset} bytes of a torn log line")
+            with open(self._log_path, "r+b") as f:
+                f.truncate(offset)
+        self._log_offset = offset
+        self._reserve(len(self.questions))
+
+    def _lock_file(self):
+        if self._log is not None and fcntl is not None:
+            fcntl.flock(self._log.fileno(), fcntl.LOCK_EX)
+
+    def _unlock_file(self):
+        if self._log is not None and fcntl is not None:
+            fcntl.flock(self._log.fileno(), fcntl.LOCK_UN)
+
+    def _map(self, capacity):
+        matrix_path = os.path.join(self.path, "vectors.f32")
+        with open(matrix_path, "ab") as f:
+            f.truncate(max(os.path.getsize(matrix_path), capacity * self.dim * 4))
+        self._matrix_file = np.memmap(matrix_path, dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+
+
+_default_index = None
+_default_index_lock = threading.Lock()
+
+
+def get_question_index():
+    """Return the process-wide question index stored under QUESTION_INDEX_PATH (empty for memory only)"""
+    global _default_index
+    with _default_index_lock:
+        if _default_index is None:
+            _default_index = QuestionIndex(
+                path=os.getenv("QUESTION_INDEX_PATH", "question_index") or None,
+                dim=int(os.getenv("QUESTION_INDEX_DIM", 256)),
+                duplicate_threshold=float(os.getenv("QUESTION_DUPLICATE_THRESHOLD", 0.8))
+            )
+        return _default_index
@@ -0,0 +1,234 @@
+import os
+import random
+import threading
+import time
+
+import metrics
+from prompts import count_message_tokens
+
+# Worth retrying: throttling, timeouts and upstream hiccups
+TRANSIENT_STATUS_CODES = {408, 409, 429}
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling the API while the circuit breaker is open"""
+
+
+class RateLimitTimeout(TimeoutError):
+    """Raised when the quota would not free up before the call deadline"""
+
+
+class TokenBucket:
+    """Thread-safe token bucket that never admits more than per_minute in any 60 second window"""
+
+    def __init__(self, per_minute, burst=None):
+        self.per_minute = per_minute
+        self.capacity = burst if burst is not None else max(1.0, per_minute / 10)
+        # Refill slower by the burst size so burst + one minute of refill stays within the quota
+        self.rate = max(per_minute - self.capacity, 1.0) / 60.0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount=1, deadline=None):
+        """Take amount tokens, waiting for a refill; returns False if that would pass the deadline"""
+        if not self.per_minute:
+            return True
+        # A single request larger than the burst would otherwise wait forever
+        amount = min(amount, self.capacity)
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return True
+                wait = (amount - self._tokens) / self.rate
+            if deadline is not None and time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+    def credit(self, amount):
+        """Return (or, if negative, take) tokens after the real cost of a request is known"""
+        if not self.per_minute:
+            return
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens + amount)
+
+    def available(self):
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures, then lets a single probe through every recovery_seconds"""
+
+    def __init__(self, failure_threshold=5, recovery_seconds=30.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._opens = 0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Whether a request may go upstream now"""
+        with self._lock:
+            if self.state == "open" and time.monotonic() - self._opened_at >= self.recovery_seconds:
+                self.state = "half_open"
+                self._probing = False
+            if self.state == "half_open" and not self._probing:
+                self._probing = True
+                return True
+            return self.state == "closed"
+
+    def release(self):
+        """Give back a probe slot that was allowed but never used"""
+        with self._lock:
+            self._probing = False
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == "half_open" or self._failures >= self.failure_threshold:
+                if self.state != "open":
+                    self._opens += 1
+                self.state = "open"
+                self._opened_at = time.monotonic()
+                self._probing = False
+
+    def stats(self):
+        with self._lock:
+            return {"open": int(self.state == "open"), "half_open": int(self.state == "half_open"),
+                    "consecutive_failures": self._failures, "opens": self._opens}
+
+
+def is_transient(error):
+    """Whether an API error is worth retrying"""
+    # Duck-typed so both SDK backends work without importing either
+    status_code = getattr(error, "status_code", None)
+    if isinstance(status_code, int):
+        return status_code in TRANSIENT_STATUS_CODES or status_code >= 500
+    if any(cls.__name__ == "APIConnectionError" for cls in type(error).__mro__):
+        return True
+    return isinstance(error, (TimeoutError, ConnectionError))
+
+
+def retry_after(error):
+    """Seconds the server asked us to wait, if it said"""
+    response = getattr(error, "response", None)
+    try:
+        return float(response.headers.get("retry-after"))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def estimate_tokens(messages, max_tokens=0):
+    """Token cost of a chat request, reserved against the tokens-per-minute budget"""
+    return count_message_tokens(messages) + max_tokens
+
+
+class LLMGuard:
+    """Rate limits, retries and circuit-breaks calls to the LLM API"""
+
+    def __init__(self, requests_per_minute=0, tokens_per_minute=0, max_attempts=4, base_delay=0.5,
+                 max_delay=8.0, deadline_seconds=20.0, breaker=None, wait_for_quota=False):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline_seconds = deadline_seconds
+        # Bulk callers queue for the quota however long it takes; the deadline then covers only the request
+        self.wait_for_quota = wait_for_quota
+
+    def call(self, fn, tokens=0, deadline=None):
+        """Run fn(timeout) within the quota, retrying transient errors until the deadline"""
+        if deadline is None:
+            deadline = time.monotonic() + self.deadline_seconds
+        attempt = 0
+        while True:
+            if self.wait_for_quota:
+                deadline += self._acquire(tokens, None)
+            else:
+                self._acquire(tokens, deadline)
+            try:
+                result = fn(max(deadline - time.monotonic(), 0.1))
+            except Exception as e:
+                if not is_transient(e):
+                    # The upstream answered; the request itself was bad
+                    self.breaker.record_success()
+                    raise
+                self.breaker.record_failure()
+                attempt += 1
+                # Full jitter keeps retrying clients from synchronizing
+                delay = retry_after(e) or random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+                if attempt >= self.max_attempts or time.monotonic() + delay >= deadline:
+                    raise
+                metrics.inc("llm_retries_total", reason=type(e).__name__)
+                time.sleep(delay)
+                continue
+
+            self.breaker.record_success()
+            usage = getattr(result, "usage", None)
+            if tokens and usage is not None and getattr(usage, "total_tokens", None):
+                self.tokens.credit(tokens - usage.total_tokens)
+            return result
+
+    def _acquire(self, tokens, deadline):
+        """Take a request and its tokens from the quota; returns the seconds spent waiting"""
+        started = time.monotonic()
+        if not self.breaker.allow():
+            raise CircuitOpenError("LLM circuit breaker is open")
+        if not (self.requests.acquire(1, deadline) and self.tokens.acquire(tokens, deadline)):
+            self.breaker.release()
+            raise RateLimitTimeout("LLM rate limit wait exceeded the call deadline")
+        waited = time.monotonic() - started
+        metrics.observe("llm_rate_limit_wait_seconds", waited)
+        return waited
+
+    def stats(self):
+        stats = self.breaker.stats()
+        stats["request_tokens_available"] = self.requests.available()
+        stats["token_budget_available"] = self.tokens.available()
+        return stats
+
+
+_default_guard = None
+_default_guard_lock = threading.Lock()
+
+
+def get_llm_guard():
+    """Return the process-wide guard shared by every session, configured from the environment"""
+    global _default_guard
+    with _default_guard_lock:
+        if _default_guard is None:
+            _default_guard = LLMGuard(
+                requests_per_minute=float(os.getenv("LLM_REQUESTS_PER_MINUTE", 0)),
+                tokens_per_minute=float(os.getenv("LLM_TOKENS_PER_MINUTE", 0)),
+                max_attempts=int(os.getenv("LLM_RETRY_ATTEMPTS", 4)),
+                base_delay=float(os.getenv("LLM_RETRY_BASE_DELAY_SECONDS", 0.5)),
+                max_delay=float(os.getenv("LLM_RETRY_MAX_DELAY_SECONDS", 8)),
+                deadline_seconds=float(os.getenv("LLM_CALL_DEADLINE_SECONDS", 20)),
+                wait_for_quota=os.getenv("LLM_WAIT_FOR_QUOTA", "false").lower() in ("1", "true", "yes"),
+                breaker=CircuitBreaker(
+                    failure_threshold=int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", 5)),
+                    recovery_seconds=float(os.getenv("CIRCUIT_RECOVERY_SECONDS", 30))
+                )
+            )
+        return _default_guard
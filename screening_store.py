@@ -0,0 +1,226 @@
+import atexit
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+
+COLUMNS = ["screening_id", "status", "recorded_at", "name", "email", "phone", "experience",
+           "position", "location", "tech_stack", "questions"]
+
+
+def has_answers(candidate_data):
+    """Whether the candidate gave any details; keys starting with an underscore are bookkeeping"""
+    return any(not key.startswith("_") for key in candidate_data or {})
+
+
+class ScreeningStore:
+    """Write-behind SQLite store for finished or abandoned screenings"""
+
+    def __init__(self, path="screenings.db", max_queue=10000, batch_size=500, flush_interval=1.0):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stats = {"submitted": 0, "written": 0, "dropped": 0, "batches": 0, "errors": 0}
+        self._stats_lock = threading.Lock()
+        self._closed = threading.Event()
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS screenings (
+                    screening_id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    recorded_at REAL NOT NULL,
+                    name TEXT,
+                    email TEXT,
+                    phone TEXT,
+                    experience REAL,
+                    position TEXT,
+                    location TEXT,
+                    tech_stack TEXT,
+                    questions TEXT
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_screenings_recorded_at ON screenings(recorded_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_screenings_status ON screenings(status)")
+
+        self._writer = threading.Thread(target=self._run, name="screening-writer", daemon=True)
+        self._writer.start()
+
+    def submit(self, candidate_data, status="completed", screening_id=None):
+        """Queue a screening for writing without blocking; returns False if it had to be dropped"""
+        row = (
+            screening_id or candidate_data.get("_screening_id") or uuid.uuid4().hex,
+            status,
+            time.time(),
+            candidate_data.get("name"),
+            candidate_data.get("email"),
+            candidate_data.get("phone"),
+            candidate_data.get("experience"),
+            candidate_data.get("position"),
+            candidate_data.get("location"),
+            json.dumps(candidate_data.get("tech_stack", [])),
+            json.dumps(candidate_data.get("questions", []))
+        )
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            self._count("dropped")
+            return False
+        self._count("submitted")
+        return True
+
+    def flush(self, timeout=None):
+        """Block until everything queued so far has been written"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self, timeout=10.0):
+        """Stop the writer after flushing the queue"""
+        if self._closed.is_set():
+            return
+        self.flush(timeout)
+        self._closed.set()
+        self._writer.join(timeout)
+
+    def query(self, status=None, since=None, until=None, technology=None, limit=None):
+        """Return recorded screenings as dicts, newest first"""
+        clauses, params = [], []
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status)
+        if since is not None:
+            clauses.append("recorded_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("recorded_at < ?")
+            params.append(until)
+        if technology is not None:
+            clauses.append("EXISTS (SELECT 1 FROM json_each(tech_stack) WHERE lower(value) = lower(?))")
+            params.append(technology)
+
+        sql = f"SELECT {', '.join(COLUMNS)} FROM screenings"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY recorded_at DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._connect() as conn:
+            rows = conn.execute(sql, params).fetchall()
+
+        screenings = []
+        for row in rows:
+            screening = dict(zip(COLUMNS, row))
+            screening["tech_stack"] = json.loads(screening["tech_stack"] or "[]")
+            screening["questions"] = json.loads(screening["questions"] or "[]")
+            screenings.append(screening)
+        return screenings
+
+    def export(self, path, **filters):
+        """Export screenings to CSV or Parquet (by file extension) for recruiters"""
+        import pandas as pd
+
+        screenings = self.query(**filters)
+        frame = pd.DataFrame(screenings, columns=COLUMNS)
+        frame["tech_stack"] = frame["tech_stack"].map(", ".join)
+        frame["questions"] = frame["questions"].map(json.dumps)
+        if path.endswith(".parquet"):
+            frame.to_parquet(path, index=False)
+        else:
+            frame.to_csv(path, index=False)
+        return len(frame)
+
+    def stats(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["queued"] = self._queue.qsize()
+        return stats
+
+    def _run(self):
+        """Drain the queue in batches until closed"""
+        conn = self._connect()
+        while not (self._closed.is_set() and self._queue.empty()):
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                conn.executemany(
+                    f"INSERT OR REPLACE INTO screenings ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                    batch
+                )
+                conn.commit()
+                self._count("written", len(batch))
+                self._count("batches")
+            except sqlite3.Error as e:
+                print(f"Screening Store Error: {e}")
+                self._count("errors")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+        conn.close()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _count(self, name, amount=1):
+        with self._stats_lock:
+            self._stats[name] += amount
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_screening_store():
+    """Return the process-wide screening store, flushed on interpreter shutdown"""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = ScreeningStore(
+                path=os.getenv("SCREENING_STORE_PATH", "screenings.db"),
+                max_queue=int(os.getenv("SCREENING_STORE_MAX_QUEUE", 10000)),
+                batch_size=int(os.getenv("SCREENING_STORE_BATCH_SIZE", 500))
+            )
+            atexit.register(_default_store.close)
+        return _default_store
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Export recorded screenings for review")
+    parser.add_argument("output", help="destination file (.csv or .parquet)")
+    parser.add_argument("--status", choices=["completed", "abandoned"])
+    parser.add_argument("--technology", help="only screenings listing this technology")
+    parser.add_argument("--since-days", type=float, help="only screenings recorded in the last N days")
+    parser.add_argument("--limit", type=int)
+    args = parser.parse_args()
+
+    since = time.time() - args.since_days * 86400 if args.since_days else None
+    count = get_screening_store().export(args.output, status=args.status, technology=args.technology,
+                                         since=since, limit=args.limit)
+    print(f"Exported {count} screenings to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
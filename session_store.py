@@ -0,0 +1,217 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+# The only per-session state; everything else (bot, clients, caches) is shared by the process
+SESSION_KEYS = ("messages", "current_stage", "candidate_data", "conversation_active",
+                "transcript_pages", "archived_messages")
+
+
+def compact_state(state):
+    """Keep just the serializable session keys"""
+    return {key: state[key] for key in SESSION_KEYS if key in state}
+
+
+class MemorySessionStore:
+    """In-process LRU session store with idle TTL"""
+
+    def __init__(self, ttl_seconds=1800, max_entries=10000, on_evict=None):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.on_evict = on_evict
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def get(self, session_id):
+        """Return the stored state for a session, or None if unknown or expired"""
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+            state, updated_at = entry
+            if time.time() - updated_at > self.ttl_seconds:
+                del self._sessions[session_id]
+                expired = [(session_id, state)]
+            else:
+                self._sessions.move_to_end(session_id)
+                return json.loads(state)
+        self._notify(expired)
+        return None
+
+    def put(self, session_id, state):
+        """Store a compact copy of the session state"""
+        data = json.dumps(compact_state(state), separators=(",", ":"))
+        with self._lock:
+            self._sessions[session_id] = (data, time.time())
+            self._sessions.move_to_end(session_id)
+            evicted = []
+            while len(self._sessions) > self.max_entries:
+                evicted.append(self._pop_oldest())
+        self._notify(evicted)
+        self.evict_expired()
+
+    def delete(self, session_id):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def evict_expired(self):
+        """Drop sessions idle for longer than the TTL; returns how many were evicted"""
+        cutoff = time.time() - self.ttl_seconds
+        evicted = []
+        with self._lock:
+            while self._sessions:
+                session_id, (_, updated_at) = next(iter(self._sessions.items()))
+                if updated_at >= cutoff:
+                    break
+                evicted.append(self._pop_oldest())
+        self._notify(evicted)
+        return len(evicted)
+
+    def _pop_oldest(self):
+        session_id, (data, _) = self._sessions.popitem(last=False)
+        return session_id, data
+
+    def _notify(self, evicted):
+        if self.on_evict is None:
+            return
+        for session_id, data in evicted:
+            self.on_evict(session_id, json.loads(data))
+
+
+class SQLiteSessionStore:
+    """SQLite-backed session store, shareable by several worker processes on one host"""
+
+    def __init__(self, path="sessions.db", ttl_seconds=1800, on_evict=None, evict_interval=60.0, table="sessions"):
+        self.path = path
+        self.table = table
+        self.ttl_seconds = ttl_seconds
+        self.on_evict = on_evict
+        self.evict_interval = evict_interval
+        self._last_eviction = 0.0
+        self._local = threading.local()
+
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {self.table} (
+                session_id TEXT PRIMARY KEY,
+                state BLOB NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{self.table}_updated_at ON {self.table}(updated_at)")
+        conn.commit()
+
+    def __len__(self):
+        return self._conn().execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def get(self, session_id):
+        row = self._conn().execute(
+            f"SELECT state, updated_at FROM {self.table} WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        if row is None or time.time() - row[1] > self.ttl_seconds:
+            return None
+        return json.loads(zlib.decompress(row[0]))
+
+    def put(self, session_id, state):
+        data = zlib.compress(json.dumps(compact_state(state), separators=(",", ":")).encode("utf-8"))
+        conn = self._conn()
+        conn.execute(
+            f"INSERT OR REPLACE INTO {self.table} (session_id, state, updated_at) VALUES (?, ?, ?)",
+            (session_id, data, time.time())
+        )
+        conn.commit()
+        if time.time() - self._last_eviction > self.evict_interval:
+            self.evict_expired()
+
+    def delete(self, session_id):
+        conn = self._conn()
+        conn.execute(f"DELETE FROM {self.table} WHERE session_id = ?", (session_id,))
+        conn.commit()
+
+    def evict_expired(self):
+        self._last_eviction = time.time()
+        cutoff = self._last_eviction - self.ttl_seconds
+        conn = self._conn()
+        rows = conn.execute(
+            f"SELECT session_id, state FROM {self.table} WHERE updated_at < ?", (cutoff,)
+        ).fetchall()
+        if not rows:
+            return 0
+        conn.executemany(
+            f"DELETE FROM {self.table} WHERE session_id = ? AND updated_at < ?",
+            [(session_id, cutoff) for session_id, _ in rows]
+        )
+        conn.commit()
+        if self.on_evict is not None:
+            for session_id, data in rows:
+                self.on_evict(session_id, json.loads(zlib.decompress(data)))
+        return len(rows)
+
+    def _conn(self):
+        """One connection per thread"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=30)
+        return conn
+
+
+def _record_abandoned(session_id, state):
+    """Screenings still in progress when their session expires are recorded as abandoned"""
+    from screening_store import get_screening_store, has_answers
+
+    candidate_data = state.get("candidate_data") or {}
+    if (has_answers(candidate_data) and not candidate_data.get("_recorded")
+            and state.get("current_stage") != "conclusion"):
+        get_screening_store().submit(candidate_data, "abandoned", screening_id=session_id)
+
+
+def _create_store(table, on_evict):
+    backend = os.getenv("SESSION_STORE", "memory")
+    ttl_seconds = float(os.getenv("SESSION_TTL_SECONDS", 1800))
+    if backend == "sqlite":
+        return SQLiteSessionStore(
+            path=os.getenv("SESSION_STORE_PATH", "sessions.db"),
+            ttl_seconds=ttl_seconds,
+            on_evict=on_evict,
+            table=table
+        )
+    if backend == "memory":
+        return MemorySessionStore(
+            ttl_seconds=ttl_seconds,
+            max_entries=int(os.getenv("SESSION_MAX_ENTRIES", 10000)),
+            on_evict=on_evict
+        )
+    raise ValueError(f"Unknown SESSION_STORE {backend!r}; expected 'memory' or 'sqlite'")
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+_default_transcript_store = None
+
+
+def get_session_store():
+    """Return the process-wide session store selected by SESSION_STORE (memory or sqlite)"""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = _create_store("sessions", _record_abandoned)
+        return _default_store
+
+
+def get_transcript_store():
+    """Return the store for spilled transcript pages, kept apart so they never count as sessions"""
+    global _default_transcript_store
+    with _default_store_lock:
+        if _default_transcript_store is None:
+            _default_transcript_store = _create_store("transcript_pages", None)
+        return _default_transcript_store
@@ -0,0 +1,88 @@
+import threading
+
+
+class _Call:
+    """A single in-flight upstream request and the callers waiting on it"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesce concurrent calls with the same key into one upstream execution"""
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0, "executions": 0, "coalesced": 0}
+
+    def do(self, key, fn, *args, **kwargs):
+        """Run fn once per key at a time; returns (result, shared) where shared is True for followers"""
+        call, leader = self.begin(key)
+        if not leader:
+            return self.wait(call), True
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            self.fail(key, call, e)
+            raise
+        self.finish(key, call, result)
+        return result, False
+
+    def begin(self, key):
+        """Join the in-flight call for a key, or start one; returns (call, is_leader)"""
+        with self._lock:
+            self._stats["calls"] += 1
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self._stats["coalesced"] += 1
+                return call, False
+
+            call = _Call()
+            self._calls[key] = call
+            self._stats["executions"] += 1
+            return call, True
+
+    def wait(self, call, timeout=None):
+        """Block until the leader publishes its result, re-raising its error"""
+        if not call.done.wait(timeout):
+            raise TimeoutError("Timed out waiting for coalesced request")
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def finish(self, key, call, result):
+        """Publish the leader's result to every waiter"""
+        call.result = result
+        self._release(key, call)
+
+    def fail(self, key, call, error):
+        """Publish the leader's error to every waiter"""
+        call.error = error
+        self._release(key, call)
+
+    def stats(self):
+        """Return call, execution and coalesced counts"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["in_flight"] = len(self._calls)
+        return stats
+
+    def _release(self, key, call):
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+        call.done.set()
+
+
+_default_single_flight = SingleFlight()
+
+
+def get_single_flight():
+    """Return the process-wide single-flight group"""
+    return _default_single_flight
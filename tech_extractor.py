@@ -0,0 +1,210 @@
+import re
+import threading
+
+# Tech stack categories for better parsing
+TECH_CATEGORIES = {
+    "Programming Languages": ["python", "java", "javascript", "typescript", "c++", "c#", "go", "rust", "php", "ruby", "swift", "kotlin"],
+    "Frontend": ["react", "vue", "angular", "html", "css", "bootstrap", "tailwind"],
+    "Backend": ["django", "flask", "fastapi", "express", "spring", "laravel", ".net"],
+    "Databases": ["mysql", "postgresql", "mongodb", "redis", "sqlite", "oracle"],
+    "Cloud & DevOps": ["aws", "azure", "gcp", "docker", "kubernetes", "jenkins", "git"],
+    "AI/ML": ["tensorflow", "pytorch", "scikit-learn", "opencv", "pandas", "numpy"]
+}
+
+# Common spellings and abbreviations mapped to their canonical technology
+TECH_ALIASES = {
+    "py": "python", "python3": "python",
+    "js": "javascript", "ecmascript": "javascript",
+    "ts": "typescript",
+    "cpp": "c++", "c plus plus": "c++",
+    "csharp": "c#", "c sharp": "c#",
+    "golang": "go",
+    "reactjs": "react", "react.js": "react",
+    "vuejs": "vue", "vue.js": "vue",
+    "angularjs": "angular",
+    "html5": "html", "css3": "css",
+    "tailwindcss": "tailwind",
+    "expressjs": "express", "express.js": "express",
+    "spring boot": "spring",
+    "dotnet": ".net", "asp.net": ".net", ".net core": ".net",
+    "postgres": "postgresql", "psql": "postgresql",
+    "mongo": "mongodb",
+    "amazon web services": "aws",
+    "microsoft azure": "azure",
+    "google cloud": "gcp", "google cloud platform": "gcp",
+    "k8s": "kubernetes",
+    "github": "git", "gitlab": "git",
+    "tf": "tensorflow",
+    "torch": "pytorch",
+    "sklearn": "scikit-learn", "scikit learn": "scikit-learn",
+    "cv2": "opencv",
+    "node": "node.js", "nodejs": "node.js",
+    "nextjs": "next.js",
+    "ror": "ruby on rails", "rails": "ruby on rails"
+}
+
+# Preferred spelling for canonical technologies that str.title() gets wrong
+TECH_DISPLAY_NAMES = {
+    "javascript": "JavaScript", "typescript": "TypeScript", "c++": "C++", "c#": "C#", "php": "PHP",
+    "html": "HTML", "css": "CSS", "fastapi": "FastAPI", ".net": ".NET",
+    "mysql": "MySQL", "postgresql": "PostgreSQL", "mongodb": "MongoDB", "sqlite": "SQLite",
+    "aws": "AWS", "gcp": "GCP", "tensorflow": "TensorFlow", "pytorch": "PyTorch",
+    "scikit-learn": "scikit-learn", "opencv": "OpenCV", "numpy": "NumPy",
+    "node.js": "Node.js", "next.js": "Next.js", "ruby on rails": "Ruby on Rails"
+}
+
+# Technologies that are also everyday words; in free text they only count when capitalized
+AMBIGUOUS_TECHS = {"go", "express", "spring", "swift", "rust", "oracle", "git", "flask", "node", "rails", "tf"}
+
+TOKEN_PATTERN = re.compile(r"\.?[A-Za-z0-9][A-Za-z0-9+#]*(?:[.\-][A-Za-z0-9+#]+)*")
+ITEM_SEPARATORS = re.compile(r"[,;\n|]")
+
+
+def tokenize(text):
+    """Split text into technology-shaped tokens, keeping forms like c++, c#, .net and node.js intact"""
+    return TOKEN_PATTERN.findall(text)
+
+
+def _within_one_edit(a, b):
+    """True if a and b differ by at most one insertion, deletion, substitution or transposition"""
+    if a == b:
+        return True
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    if len(a) == len(b):
+        return a[i + 1:] == b[i + 1:] or (
+            i + 1 < len(a) and a[i] == b[i + 1] and a[i + 1] == b[i] and a[i + 2:] == b[i + 2:]
+        )
+    return a[i:] == b[i + 1:]
+
+
+class TechExtractor:
+    """Precompiled, alias-aware matcher that extracts canonical technologies from free text"""
+
+    def __init__(self, tech_categories, aliases=None, ambiguous=None, fuzzy_min_length=6):
+        self.fuzzy_min_length = fuzzy_min_length
+        self.ambiguous = set(ambiguous if ambiguous is not None else AMBIGUOUS_TECHS)
+        self.categories = {}
+
+        terms = {}
+        for category, techs in tech_categories.items():
+            for tech in techs:
+                terms[tech] = tech
+                self.categories[tech] = category
+        for alias, canonical in (aliases if aliases is not None else TECH_ALIASES).items():
+            terms[alias] = canonical
+            terms.setdefault(canonical, canonical)
+
+        # Inverted index: first token -> phrases starting with it, longest first
+        self._phrases = {}
+        for term, canonical in terms.items():
+            tokens = tuple(token.lower() for token in tokenize(term))
+            if tokens:
+                self._phrases.setdefault(tokens[0], []).append((tokens, canonical))
+        for phrases in self._phrases.values():
+            phrases.sort(key=lambda phrase: len(phrase[0]), reverse=True)
+
+        # Symmetric-delete index over long, unambiguous single-token terms, bounding fuzzy matching to one edit
+        self._single = {tokens[0]: canonical for phrases in self._phrases.values()
+                        for tokens, canonical in phrases
+                        if len(tokens) == 1 and len(tokens[0]) >= fuzzy_min_length and tokens[0] not in self.ambiguous}
+        self._deletes = {}
+        for term in self._single:
+            for variant in self._deletions(term):
+                self._deletes.setdefault(variant, set()).add(term)
+
+    @property
+    def vocabulary_size(self):
+        return sum(len(phrases) for phrases in self._phrases.values())
+
+    def extract(self, text, strict_ambiguous=True):
+        """Return canonical technologies found in text, in order of first appearance"""
+        raw_tokens = tokenize(text)
+        tokens = [token.lower() for token in raw_tokens]
+        found = []
+        seen = set()
+
+        i = 0
+        while i < len(tokens):
+            match = self._match_at(tokens, i)
+            if match is not None:
+                length, canonical = match
+                if length == 1 and strict_ambiguous and tokens[i] in self.ambiguous and raw_tokens[i].islower():
+                    match = None
+            elif not strict_ambiguous and len(tokens[i]) >= self.fuzzy_min_length - 1:
+                # Typos are only corrected in short list items; in free text near-misses are ordinary words
+                canonical = self._fuzzy(tokens[i])
+                match = (1, canonical) if canonical else None
+
+            if match is None:
+                i += 1
+                continue
+
+            if canonical not in seen:
+                seen.add(canonical)
+                found.append(canonical)
+            i += match[0]
+
+        return found
+
+    def parse_items(self, text):
+        """Split a comma/semicolon separated list and return (item, canonical technologies) pairs"""
+        results = []
+        for item in ITEM_SEPARATORS.split(text):
+            item = item.strip()
+            if len(item) <= 1:
+                continue
+            # Short list items are taken at face value, typos included; longer free text needs exact spellings
+            # and capitalized ambiguous words
+            strict = len(tokenize(item)) > 2
+            results.append((item, self.extract(item, strict_ambiguous=strict)))
+        return results
+
+    def category(self, canonical):
+        """Return the category of a canonical technology, or None for alias-only technologies"""
+        return self.categories.get(canonical)
+
+    @staticmethod
+    def display_name(canonical):
+        """Return the preferred spelling for a canonical technology"""
+        return TECH_DISPLAY_NAMES.get(canonical, canonical.title())
+
+    def _match_at(self, tokens, i):
+        """Longest phrase starting at tokens[i], as (token_count, canonical), or None"""
+        for phrase, canonical in self._phrases.get(tokens[i], ()):
+            if tuple(tokens[i:i + len(phrase)]) == phrase:
+                return len(phrase), canonical
+        return None
+
+    def _fuzzy(self, token):
+        """Resolve a token within one edit of exactly one known single-token term"""
+        candidates = set(self._deletes.get(token, ()))
+        for variant in self._deletions(token):
+            candidates.update(self._deletes.get(variant, ()))
+            if variant in self._single:
+                candidates.add(variant)
+        matches = {self._single[term] for term in candidates if _within_one_edit(token, term)}
+        return matches.pop() if len(matches) == 1 else None
+
+    @staticmethod
+    def _deletions(term):
+        return {term[:i] + term[i + 1:] for i in range(len(term))}
+
+
+_default_extractor = None
+_default_extractor_lock = threading.Lock()
+
+
+def get_tech_extractor():
+    """Return the process-wide extractor built from TECH_CATEGORIES and TECH_ALIASES"""
+    global _default_extractor
+    with _default_extractor_lock:
+        if _default_extractor is None:
+            _default_extractor = TechExtractor(TECH_CATEGORIES)
+        return _default_extractor